@@ -0,0 +1,114 @@
+"""Arris CM3500 Modem Anomalies."""
+
+import logging
+import math
+
+from .ArrisCM3500ModemEntities import is_padded
+from .const import (
+    ANOMALY_ALPHA,
+    ANOMALY_METRICS,
+    ANOMALY_MIN_SAMPLES,
+    ANOMALY_MIN_STD,
+    CHANNEL_ID_KEYS,
+    COUNTER_FIELDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MetricStats:
+    """Exponentially weighted moving mean and variance of one channel metric."""
+
+    __slots__ = ("count", "mean", "variance", "last")
+
+    def __init__(self) -> None:
+        """Init MetricStats class."""
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.last = None
+
+    def score(self, value: float) -> float | None:
+        """Return the deviation of a sample in standard deviations."""
+        if self.count < ANOMALY_MIN_SAMPLES:
+            return None
+        return (value - self.mean) / max(math.sqrt(self.variance), ANOMALY_MIN_STD)
+
+    def update(self, value: float) -> None:
+        """Add a sample in O(1)."""
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return
+        delta = value - self.mean
+        self.mean += ANOMALY_ALPHA * delta
+        self.variance = (1 - ANOMALY_ALPHA) * (
+            self.variance + ANOMALY_ALPHA * delta * delta
+        )
+
+
+class ArrisCM3500ModemAnomalies:
+    """Streaming anomaly detection on the channel metrics."""
+
+    def __init__(self, sigma: float) -> None:
+        """Init ArrisCM3500ModemAnomalies class."""
+        self.sigma = sigma
+        self.stats = {}
+        # Anomalous metrics and their scores, per channel kind and channel id
+        self.channels = {kind: {} for kind in ANOMALY_METRICS}
+
+    def update(self, modem_data: dict) -> list[dict]:
+        """Score and add the samples of a poll, return the new anomalies."""
+        new_anomalies = []
+        for kind, fields in ANOMALY_METRICS.items():
+            id_key = CHANNEL_ID_KEYS[kind]
+            channels = {}
+            for channel in modem_data.get(kind, []):
+                if is_padded(channel, id_key):
+                    continue
+
+                channel_id = str(channel[id_key])
+                previous = self.channels[kind].get(channel_id, {})
+                anomalies = {}
+                for field in fields:
+                    try:
+                        value = float(channel[field])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+
+                    stats = self.stats.get((kind, channel_id, field))
+                    if stats is None:
+                        stats = self.stats[kind, channel_id, field] = MetricStats()
+
+                    if field in COUNTER_FIELDS:
+                        last, stats.last = stats.last, value
+                        # Skip the first sample and counter resets
+                        if last is None or value < last:
+                            continue
+                        value -= last
+
+                    score = stats.score(value)
+                    mean = stats.mean
+                    stats.update(value)
+                    if score is None or abs(score) < self.sigma:
+                        continue
+
+                    anomalies[field] = round(score, 2)
+                    if field not in previous:
+                        new_anomalies.append(
+                            {
+                                "kind": kind,
+                                "channel_id": channel_id,
+                                "metric": field,
+                                "value": value,
+                                "mean": round(mean, 2),
+                                "score": anomalies[field],
+                            }
+                        )
+                if anomalies:
+                    channels[channel_id] = anomalies
+            self.channels[kind] = channels
+
+        if new_anomalies:
+            _LOGGER.debug("New channel anomalies: %s", new_anomalies)
+        return new_anomalies
@@ -3,6 +3,11 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from .ArrisCM3500ModemEventLog import ArrisCM3500ModemEventLog
+from .ArrisCM3500ModemHealth import ArrisCM3500ModemHealth
+from .ArrisCM3500ModemStats import ArrisCM3500ModemStats, COUNTERS, STAGES
+from .const import CHANNEL_PREFIXES, PAGE_SENSORS
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -10,12 +15,35 @@ class ArrisCM3500ModemDashboard:
     """Init ArrisCM3500Modem coordinator class."""
 
     def __init__(
-        self, hass: HomeAssistant, config_entry: ConfigEntry, modem_data: dict
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        modem_data: dict,
+        stats: ArrisCM3500ModemStats,
+        pages: dict | None = None,
+        event_log: ArrisCM3500ModemEventLog | None = None,
+        anomalies: dict | None = None,
+        health: ArrisCM3500ModemHealth | None = None,
+        sampled_at: datetime.datetime | None = None,
     ) -> None:
         """Initialize ArrisCM3500Modem coordinator."""
         self.hass = hass
         self.config_entry: ConfigEntry = config_entry
         self.modem_data = modem_data
+        self.pages = pages or {}
+        self.last_sample = sampled_at
+        self.anomalies = anomalies or {}
+        self.health_score = health.score if health is not None else None
+        self.health_score_attributes = health.channels if health is not None else {}
+        self.critical_events_per_hour = (
+            event_log.critical_per_hour if event_log is not None else None
+        )
+
+        # Snapshot of the stats: fetch stages of this poll, writes of the previous one
+        self.stats_values = {
+            **{f"{stage}_duration": value for stage, value in stats.durations.items()},
+            **stats.counters,
+        }
 
         # Create lookup tables for faster access
         self.downstream_qam_lookup = {
@@ -31,10 +59,26 @@ class ArrisCM3500ModemDashboard:
             str(ch.get("UCID_OFDM")): ch for ch in modem_data.get("Upstream_OFDM", [])
         }
 
+    @property
+    def is_critical_events_per_hour_supported(self):
+        return True
+
+    @property
+    def is_last_sample_supported(self):
+        return True
+
+    @property
+    def is_health_score_supported(self):
+        return True
+
     def get_value(self, lookup, channel_id, key):
         """Generic method to get the value for modem data."""
         return lookup.get(str(channel_id), {}).get(key)
 
+    def get_page_value(self, page, label):
+        """Return the value of a page label."""
+        return self.pages.get(page, {}).get(label)
+
 
 # Helper function to dynamically create properties
 def create_properties(cls, prefix, id_range, keys, getter_func):
@@ -48,9 +92,9 @@ def create_properties(cls, prefix, id_range, keys, getter_func):
             def getter(self, channel_id=channel_id, key=key):
                 return getter_func(self, channel_id, key)
 
-            # Property to get the last update timestamp
+            # Property to get the time the channel was sampled
             def last_update(self):
-                return datetime.datetime.now(datetime.UTC)
+                return self.last_sample
 
             # Property to check if supported
             def is_supported(self):
@@ -61,6 +105,19 @@ def create_properties(cls, prefix, id_range, keys, getter_func):
             setattr(cls, supported_attr, property(is_supported))
 
 
+# Helper function to create the anomaly properties of each channel
+def create_anomaly_properties(cls, kind, id_range):
+    for channel_id in id_range:
+        attr_name = f"{CHANNEL_PREFIXES[kind]}_{channel_id}_anomaly"
+
+        def anomalies(self, channel_id=str(channel_id)):
+            return self.anomalies.get(kind, {}).get(channel_id, {})
+
+        setattr(cls, attr_name, property(lambda self, get=anomalies: bool(get(self))))
+        setattr(cls, f"{attr_name}_attributes", property(anomalies))
+        setattr(cls, f"is_{attr_name}_supported", property(lambda self: True))
+
+
 # Apply properties to the class
 create_properties(
     ArrisCM3500ModemDashboard,
@@ -115,3 +172,37 @@ create_properties(
         self.upstream_ofdm_lookup, ucid_ofdm, key
     ),
 )
+
+create_anomaly_properties(ArrisCM3500ModemDashboard, "Downstream_QAM", range(1, 33))
+create_anomaly_properties(ArrisCM3500ModemDashboard, "Upstream_QAM", range(1, 13))
+create_anomaly_properties(ArrisCM3500ModemDashboard, "Downstream_OFDM", range(1, 3))
+create_anomaly_properties(ArrisCM3500ModemDashboard, "Upstream_OFDM", range(0, 2))
+
+for stats_key in [f"{stage}_duration" for stage in STAGES] + list(COUNTERS):
+    setattr(
+        ArrisCM3500ModemDashboard,
+        f"stats_{stats_key}",
+        property(lambda self, key=stats_key: self.stats_values[key]),
+    )
+    setattr(
+        ArrisCM3500ModemDashboard,
+        f"is_stats_{stats_key}_supported",
+        property(lambda self: True),
+    )
+
+for page_attr, (page, label, _) in PAGE_SENSORS.items():
+    setattr(
+        ArrisCM3500ModemDashboard,
+        page_attr,
+        property(lambda self, page=page, label=label: self.get_page_value(page, label)),
+    )
+    setattr(
+        ArrisCM3500ModemDashboard,
+        f"{page_attr}_attributes",
+        property(lambda self, page=page: self.pages.get(page, {})),
+    )
+    setattr(
+        ArrisCM3500ModemDashboard,
+        f"is_{page_attr}_supported",
+        property(lambda self: True),
+    )
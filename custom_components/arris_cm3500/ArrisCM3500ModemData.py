@@ -1,18 +1,72 @@
 """Arris CM3500 Modem Data."""
 
+import asyncio
+import codecs
+from collections import deque
+from dataclasses import dataclass
+import datetime
+from enum import StrEnum
 import logging
-from bs4 import BeautifulSoup
-import re
+from time import monotonic, perf_counter
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout, hdrs
+
+from .const import (
+    HEAD_SIZE,
+    MAX_CONCURRENT_REQUESTS,
+    MODEM_PAGES,
+    RAW_RESPONSE_BUFFER_SIZE,
+    STATUS_PAGE,
+    STREAM_CHUNK_SIZE,
+)
+from .ArrisCM3500ModemParser import (
+    ArrisCM3500ModemParser,
+    EventLogParser,
+    KeyValueParser,
+    TableParser,
+    extract_data,
+)
+from .ArrisCM3500ModemEventLog import ArrisCM3500ModemEventLog
+from .ArrisCM3500ModemStats import ArrisCM3500ModemStats
 
 _LOGGER = logging.getLogger(__name__)
 
+# Parser of the additional label/value pages, the event log is parsed
+# incrementally from its high-water mark
+PAGE_PARSERS = {
+    "system": KeyValueParser,
+    "provisioning": KeyValueParser,
+}
+
+
+class ArrisCM3500ModemStatus(StrEnum):
+    """Outcome of a request to the modem."""
+
+    SUCCESS = "success"
+    AUTH_REQUIRED = "auth_required"
+    HTTP_ERROR = "http_error"
+    PARSE_ERROR = "parse_error"
+
+
+@dataclass(slots=True)
+class ArrisCM3500ModemResult:
+    """Result of a request to the modem."""
+
+    status: ArrisCM3500ModemStatus
+    data: dict | None = None
+    error: str | None = None
+
+    def __bool__(self) -> bool:
+        """Return true if the request succeeded."""
+        return self.status is ArrisCM3500ModemStatus.SUCCESS
+
 
 class ArrisCM3500ModemData:
     """Main ArrisCM3500ModemData class to Arris CM3500 services."""
 
-    def __init__(self, host: str, username: str, password: str) -> None:
+    def __init__(
+        self, host: str, username: str, password: str, session: ClientSession
+    ) -> None:
         """Init ArrisCM3500ModemData class."""
         self.host = host
         self.username = username
@@ -20,10 +74,35 @@ class ArrisCM3500ModemData:
         self.cookies = None
         self.random_string = ""
         self.code = ""
-        self.session = ClientSession()
+        self.session = session
+        self.stats = ArrisCM3500ModemStats()
+        self.raw_responses = deque(maxlen=RAW_RESPONSE_BUFFER_SIZE)
+        self.request_limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self.pages = {}
+        self.pages_fetched = {}
+        self.event_log = ArrisCM3500ModemEventLog()
+        # Channel table schemas of the status page, by firmware fingerprint
+        self.table_schemas = {}
+        # Fetch shared by the callers asking for the modem status meanwhile
+        self.status_task = None
+
+    @property
+    def firmware_fingerprint(self) -> str | None:
+        """Return the hardware and software version, once the system page is read."""
+        system = self.pages.get("system", {})
+        if "Software Version" not in system:
+            return None
+        return f"{system.get('Hardware Model')}/{system['Software Version']}"
 
-    async def login(self) -> bool:
+    async def login(
+        self, timeout: ClientTimeout | None = None
+    ) -> ArrisCM3500ModemResult:
         """Start session."""
+        with self.stats.measure("login"):
+            return await self._login(timeout)
+
+    async def _login(self, timeout: ClientTimeout | None) -> ArrisCM3500ModemResult:
+        """Post the credentials to the login page."""
         _LOGGER.debug("Initiating new login")
 
         try:
@@ -34,251 +113,332 @@ class ArrisCM3500ModemData:
             url = "https://" + self.host + "/cgi-bin/login_cgi"
 
             async with self.session.post(
-                url, data=payload, verify_ssl=False
+                url,
+                data=payload,
+                verify_ssl=False,
+                allow_redirects=False,
+                **({"timeout": timeout} if timeout else {}),
             ) as response:
-                _LOGGER.debug("Request URL: %s", url)
-                _LOGGER.debug("Request headers: %s", self.session.headers)
-                _LOGGER.debug("Response headers: %s", response.headers)
-                if response.status == 200:
-                    response_text = await response.text()
-                    _LOGGER.debug("Response: %s", response_text)
-                    if "url=status_cgi" in response_text:
-                        self.cookies = response.cookies
-                        return True
+                self.log_request(url, response)
+                head = await self.read_head(response)
+                self.capture_response(url, response.status, head)
+                await self.discard_rest(response)
+
+                if 300 <= response.status < 400:
+                    success = "status_cgi" in response.headers.get(hdrs.LOCATION, "")
+                elif response.status == 200:
+                    success = (
+                        "status_cgi" in response.headers.get("Refresh", "")
+                        or b"url=status_cgi" in head
+                    )
                 else:
-                    response_text = await response.text()
                     _LOGGER.error("Failed to login")
-                    _LOGGER.debug(
-                        "Not success status code [%s] response: %s",
-                        response.status,
-                        response_text,
+                    _LOGGER.debug("Not success status code [%s]", response.status)
+                    return ArrisCM3500ModemResult(
+                        ArrisCM3500ModemStatus.HTTP_ERROR,
+                        error=f"Login returned status code {response.status}",
                     )
-                return False
-        except Exception as error:
+
+                if success:
+                    self.cookies = response.cookies
+                    return ArrisCM3500ModemResult(ArrisCM3500ModemStatus.SUCCESS)
+                return ArrisCM3500ModemResult(
+                    ArrisCM3500ModemStatus.AUTH_REQUIRED, error="Login rejected"
+                )
+        except (ClientError, TimeoutError) as error:
             _LOGGER.error("Error during the login process, error %s", error)
-            return False
+            return ArrisCM3500ModemResult(
+                ArrisCM3500ModemStatus.HTTP_ERROR, error=str(error)
+            )
+
+    async def get_modem_status(self) -> ArrisCM3500ModemResult:
+        """Get modem status, sharing the fetch already in progress if any."""
+        if self.status_task is None:
+            self.status_task = asyncio.get_running_loop().create_task(
+                self._get_modem_status()
+            )
+            self.status_task.add_done_callback(self._status_task_done)
+        else:
+            _LOGGER.debug("Joining the modem status fetch in progress")
+        # A cancelled caller leaves the fetch running for the others
+        return await asyncio.shield(self.status_task)
 
-    async def get_modem_status(self) -> dict:
-        """Get modem status."""
+    def _status_task_done(self, task: asyncio.Task) -> None:
+        self.status_task = None
+
+    async def _get_modem_status(self) -> ArrisCM3500ModemResult:
+        """Log in if needed, then fetch the status page and the due pages."""
         _LOGGER.debug("Getting modem status data")
 
         try:
-            modem_raw_data = await self.get_raw_modem_status_data()
-            if "login_failed" in modem_raw_data:
-                return modem_raw_data
-            modem_data = self.extract_data(modem_raw_data)
-            return modem_data
-        except Exception as error:
+            url = "https://" + self.host + "/cgi-bin/" + STATUS_PAGE
+
+            # Reuse the session of a previous login until the modem rejects it
+            reused_session = self.cookies is not None
+            if reused_session:
+                self.stats.record("login", 0)
+            elif not (result := await self.login()):
+                return result
+
+            result = await self.fetch_pages(url)
+
+            if reused_session and result.status is ArrisCM3500ModemStatus.AUTH_REQUIRED:
+                _LOGGER.debug("Session expired")
+                self.cookies = None
+                if not (result := await self.login()):
+                    return result
+                result = await self.fetch_pages(url)
+
+            if result.status is ArrisCM3500ModemStatus.AUTH_REQUIRED:
+                self.cookies = None
+            return result
+        except (ClientError, TimeoutError) as error:
             _LOGGER.error(
                 "Error during the modem status data retrieval process, error %s", error
             )
-            return {"error_message": error}
-
-    async def get_raw_modem_status_data(self) -> str:
-        """Get raw modem status data."""
-        _LOGGER.debug("Getting raw modem status data")
+            return ArrisCM3500ModemResult(
+                ArrisCM3500ModemStatus.HTTP_ERROR, error=str(error)
+            )
+        except Exception as error:
+            _LOGGER.error("Error during the raw data conversion, error %s", error)
+            return ArrisCM3500ModemResult(
+                ArrisCM3500ModemStatus.PARSE_ERROR, error=str(error)
+            )
 
-        try:
-            if not await self.login():
-                return "login_failed"
+    async def fetch_pages(self, url: str) -> ArrisCM3500ModemResult:
+        """Fetch the status page and the additional pages that are due concurrently."""
+        now = monotonic()
+        due_pages = [
+            name
+            for name, page in MODEM_PAGES.items()
+            if name not in self.pages_fetched
+            or now - self.pages_fetched[name] >= page["interval"]
+        ]
+        # Pages served at the status page URL are parsed from the status
+        # response, read to the end when one of them is due
+        status_pages = [
+            name for name in due_pages if MODEM_PAGES[name]["path"] == STATUS_PAGE
+        ]
+        with self.stats.measure("status_fetch"):
+            result, *_ = await asyncio.gather(
+                self._fetch_status_page(url, status_pages),
+                *(
+                    self.fetch_page(name)
+                    for name in due_pages
+                    if name not in status_pages
+                ),
+            )
+        return result
 
-            url = "https://" + self.host + "/cgi-bin/status_cgi"
+    async def fetch_page(self, name: str) -> None:
+        """Fetch and parse one of the additional modem pages."""
+        url = "https://" + self.host + "/cgi-bin/" + MODEM_PAGES[name]["path"]
 
-            async with self.session.get(
-                url, cookies=self.cookies, verify_ssl=False
-            ) as response:
-                _LOGGER.debug("Request URL: %s", url)
-                _LOGGER.debug("Request headers: %s", self.session.headers)
-                _LOGGER.debug("Response headers: %s", response.headers)
-                if response.status == 200:
-                    response_text = await response.text()
-                    _LOGGER.debug("Response: %s", response_text)
-                    if "Touchstone Status" in response_text:
-                        return response_text
-                    else:
-                        return "error"
-                else:
-                    response_text = await response.text()
-                    _LOGGER.error("Failed to retrieve raw modem status data")
+        try:
+            async with (
+                self.request_limit,
+                self.session.get(
+                    url, cookies=self.cookies, verify_ssl=False, allow_redirects=False
+                ) as response,
+            ):
+                self.log_request(url, response)
+                head = await self.read_head(response)
+                if response.status != 200 or b'name="password"' in head:
+                    self.capture_response(url, response.status, head)
+                    await self.discard_rest(response)
                     _LOGGER.debug(
-                        "Not success status code [%s] response: %s",
+                        "Failed to retrieve the %s page, status code [%s]",
+                        name,
                         response.status,
-                        response_text,
                     )
-                return False
+                    return
+
+                if name == "events":
+                    parser = EventLogParser(self.event_log.mark)
+                else:
+                    parser = PAGE_PARSERS[name]()
+                body, _ = await self.stream_page(response, head, parser)
+                self.capture_response(url, response.status, body)
+
+            if name == "events":
+                self.event_log.ingest(parser.result())
+            else:
+                self.pages[name] = parser.result()
+            self.pages_fetched[name] = monotonic()
+        except (ClientError, TimeoutError) as error:
+            _LOGGER.warning("Error while retrieving the %s page, error %s", name, error)
         except Exception as error:
-            _LOGGER.error(
-                "Error during the raw modem status data retrieval process, error %s",
-                error,
+            # A bad additional page must not fail the status poll it runs with
+            _LOGGER.warning("Error while parsing the %s page, error %s", name, error)
+
+    async def _fetch_status_page(
+        self, url: str, pages: list[str]
+    ) -> ArrisCM3500ModemResult:
+        """Fetch and parse the status page and the given pages it serves."""
+        async with (
+            self.request_limit,
+            self.session.get(
+                url, cookies=self.cookies, verify_ssl=False, allow_redirects=False
+            ) as response,
+        ):
+            self.log_request(url, response)
+            if response.status == 200:
+                return await self.parse_status_page(url, response, pages)
+
+            self.capture_response(url, response.status, await self.read_head(response))
+            await self.discard_rest(response)
+            if response.status in (401, 403) or 300 <= response.status < 400:
+                _LOGGER.debug("Session rejected with status code [%s]", response.status)
+                return ArrisCM3500ModemResult(ArrisCM3500ModemStatus.AUTH_REQUIRED)
+
+            _LOGGER.error("Failed to retrieve raw modem status data")
+            _LOGGER.debug("Not success status code [%s]", response.status)
+            return ArrisCM3500ModemResult(
+                ArrisCM3500ModemStatus.HTTP_ERROR,
+                error=f"Status page returned status code {response.status}",
             )
-            return {"status_code": None, "error_message": error}
 
-    def extract_data(self, raw_response: str) -> dict:
-        """Extract data from HTML code."""
-        _LOGGER.debug("Extracting data from HTML code")
+    async def parse_status_page(
+        self, url: str, response: ClientResponse, pages: list[str]
+    ) -> ArrisCM3500ModemResult:
+        """Stream the status page into the parsers.
+
+        Reading stops after the channel tables unless one of the given pages,
+        parsed from the same response, needs the rest of it.
+        """
+        head = await self.read_head(response)
+        if b"Touchstone Status" not in head:
+            self.capture_response(url, response.status, head)
+            await self.discard_rest(response)
+            if b"login_cgi" in head or b"password" in head:
+                return ArrisCM3500ModemResult(ArrisCM3500ModemStatus.AUTH_REQUIRED)
+            return ArrisCM3500ModemResult(
+                ArrisCM3500ModemStatus.PARSE_ERROR, error="Not a status page"
+            )
+
+        fingerprint = self.firmware_fingerprint
+        parser = ArrisCM3500ModemParser(self.table_schemas.get(fingerprint))
+        page_parsers = {name: PAGE_PARSERS[name]() for name in pages}
+        body, parse_time = await self.stream_page(
+            response, head, parser, *page_parsers.values()
+        )
+        self.stats.record("parse", parse_time)
+        self.table_schemas[fingerprint] = parser.schemas
+        self.capture_response(url, response.status, body)
+        for name, page_parser in page_parsers.items():
+            self.pages[name] = page_parser.result()
+            self.pages_fetched[name] = monotonic()
 
-        response = {
-            "Downstream_QAM": [],
-            "Downstream_OFDM": [],
-            "Upstream_QAM": [],
-            "Upstream_OFDM": [],
-        }
+        return ArrisCM3500ModemResult(
+            ArrisCM3500ModemStatus.SUCCESS, data=parser.result()
+        )
 
+    async def stream_page(
+        self, response: ClientResponse, head: bytes, *parsers: TableParser
+    ) -> tuple[bytes, float]:
+        """Feed the body to the parsers chunk by chunk until they are all done.
+
+        Return the bytes read and the time spent parsing them, in seconds.
+        """
+        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+            errors="replace"
+        )
+        body = bytearray(head)
         try:
-            soup = BeautifulSoup(raw_response, "html.parser")
-            tables = soup.find_all("table")
-
-            for table in tables:
-                rows = table.find_all("tr")
-                for row in rows:
-                    cells = row.find_all("td")
-                    if len(cells) == 9:
-                        (
-                            cell0,
-                            cell1,
-                            cell2,
-                            cell3,
-                            cell4,
-                            cell5,
-                            cell6,
-                            cell7,
-                            cell8,
-                        ) = [c.text.strip() for c in cells]
-
-                        if "QAM" in cell5:
-                            response["Downstream_QAM"].append(
-                                {
-                                    "DCID": cell1,
-                                    "Frequency": self.clean_value(cell2),
-                                    "Power": self.clean_value(cell3),
-                                    "SNR": self.clean_value(cell4),
-                                    "Modulation": cell5,
-                                    "Correcteds": self.clean_value(cell7),
-                                    "Uncorrectables": self.clean_value(cell8),
-                                }
-                            )
-
-                        if "4K" in cell1:
-                            response["Downstream_OFDM"].append(
-                                {
-                                    "DCID_OFDM": self.clean_value(cell0),
-                                    "FFT_Type": cell1,
-                                    "Channel_Width": self.clean_value(cell2),
-                                    "Active_Subcarriers": self.clean_value(cell3),
-                                    "First_Subcarrier": self.clean_value(cell4),
-                                    "Last_Subcarrier": self.clean_value(cell5),
-                                    "RxMER_Pilot": self.clean_value(cell6),
-                                    "RxMER_PLC": self.clean_value(cell7),
-                                    "RxMER_Data": self.clean_value(cell8),
-                                }
-                            )
-
-                        if "2K" in cell1:
-                            response["Upstream_OFDM"].append(
-                                {
-                                    "UCID_OFDM": self.clean_value(cell0),
-                                    "FFT_Type": cell1,
-                                    "Channel_Width": self.clean_value(cell2),
-                                    "Active_Subcarriers": self.clean_value(cell3),
-                                    "First_Subcarrier": self.clean_value(cell4),
-                                    "Last_Subcarrier": self.clean_value(cell5),
-                                    "Lower_Frequency": self.clean_value(cell6),
-                                    "Upper_Frequency": self.clean_value(cell7),
-                                    "Tx_Power": self.clean_value(cell8),
-                                }
-                            )
-
-                    if len(cells) == 7:
-                        cell1, cell2, cell3, cell4, cell5, cell6 = [
-                            c.text.strip() for c in cells[1:]
-                        ]
-
-                        if "ATDMA" in cell4:
-                            response["Upstream_QAM"].append(
-                                {
-                                    "UCID": cell1,
-                                    "Frequency": self.clean_value(cell2),
-                                    "Power": self.clean_value(cell3),
-                                    "Channel_Type": cell4,
-                                    "Symbol_Rate": self.clean_value(cell5),
-                                    "Modulation": cell6,
-                                }
-                            )
-
-            # Add missing channels with default values
-            for dcid in range(1, 33):
-                if not any(
-                    ch["DCID"] == str(dcid) for ch in response["Downstream_QAM"]
-                ):
-                    response["Downstream_QAM"].append(
-                        {
-                            "DCID": str(dcid),
-                            "Frequency": 0,
-                            "Power": 0,
-                            "SNR": 0,
-                            "Modulation": "N/A",
-                            "Correcteds": 0,
-                            "Uncorrectables": 0,
-                        }
-                    )
+            start = perf_counter()
+            self.feed_parsers(parsers, decoder.decode(head))
+            parse_time = perf_counter() - start
 
-            for ucid in range(1, 9):
-                if not any(ch["UCID"] == str(ucid) for ch in response["Upstream_QAM"]):
-                    response["Upstream_QAM"].append(
-                        {
-                            "UCID": str(ucid),
-                            "Frequency": 0,
-                            "Power": 0,
-                            "Channel_Type": "N/A",
-                            "Symbol_Rate": 0,
-                            "Modulation": "N/A",
-                        }
-                    )
+            if not all(parser.done for parser in parsers):
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    body += chunk
+                    start = perf_counter()
+                    self.feed_parsers(parsers, decoder.decode(chunk))
+                    parse_time += perf_counter() - start
+                    if all(parser.done for parser in parsers):
+                        _LOGGER.debug(
+                            "%s done after %d bytes",
+                            ", ".join(type(parser).__name__ for parser in parsers),
+                            len(body),
+                        )
+                        break
+                else:
+                    self.feed_parsers(parsers, decoder.decode(b"", final=True))
+                    for parser in parsers:
+                        if not parser.done:
+                            parser.close()
+        except BaseException:
+            # A read cut short by a timeout or a parse error leaves the body
+            # half read, the connection must not go back to the pool
+            response.close()
+            raise
+        if all(parser.done for parser in parsers):
+            await self.discard_rest(response)
 
-            for dcid_ofdm in range(1, 3):
-                if not any(
-                    ch["DCID_OFDM"] == str(dcid_ofdm)
-                    for ch in response["Downstream_OFDM"]
-                ):
-                    response["Downstream_OFDM"].append(
-                        {
-                            "DCID_OFDM": str(dcid_ofdm),
-                            "FFT_Type": "N/A",
-                            "Channel_Width": 0,
-                            "Active_Subcarriers": 0,
-                            "First_Subcarrier": 0,
-                            "Last_Subcarrier": 0,
-                            "RxMER_Pilot": 0,
-                            "RxMER_PLC": 0,
-                            "RxMER_Data": 0,
-                        }
-                    )
+        self.stats.count("bytes_downloaded", len(body) - len(head))
+        self.stats.count("rows_parsed", sum(parser.rows_parsed for parser in parsers))
+        return bytes(body), parse_time
 
-            for ucid_ofdm in range(0, 2):
-                if not any(
-                    ch["UCID_OFDM"] == str(ucid_ofdm)
-                    for ch in response["Upstream_OFDM"]
-                ):
-                    response["Upstream_OFDM"].append(
-                        {
-                            "UCID_OFDM": str(ucid_ofdm),
-                            "FFT_Type": "N/A",
-                            "Channel_Width": 0,
-                            "Active_Subcarriers": 0,
-                            "First_Subcarrier": 0,
-                            "Last_Subcarrier": 0,
-                            "Lower_Frequency": 0,
-                            "Upper_Frequency": 0,
-                            "Tx_Power": 0,
-                        }
-                    )
+    @staticmethod
+    def feed_parsers(parsers: tuple[TableParser, ...], text: str) -> None:
+        """Feed the text to the parsers that still need the page."""
+        for parser in parsers:
+            if not parser.done:
+                parser.feed(text)
 
-            return response
+    def log_request(self, url: str, response: ClientResponse) -> None:
+        """Log the request and response headers when debug logging is enabled."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Request URL: %s", url)
+            _LOGGER.debug("Request headers: %s", dict(self.session.headers))
+            _LOGGER.debug("Response headers: %s", dict(response.headers))
 
-        except Exception as error:
-            _LOGGER.error("Error during the raw data conversion, error %s", error)
-            return response
+    async def read_head(self, response: ClientResponse) -> bytes:
+        """Read the first chunk of the body, enough to hold the page head."""
+        head = bytearray()
+        while len(head) < HEAD_SIZE:
+            chunk = await response.content.read(HEAD_SIZE - len(head))
+            if not chunk:
+                break
+            head += chunk
+        self.stats.count("bytes_downloaded", len(head))
+        return bytes(head)
 
-    def clean_value(self, value: str) -> float:
-        cleaned_value = re.sub(r"[^\d.-]", "", value)
-        return cleaned_value if cleaned_value else 0
+    async def discard_rest(self, response: ClientResponse) -> None:
+        """Drop the unread rest of the body.
+
+        A body received in full is drained so its pooled connection is reused
+        cleanly, otherwise the connection is closed instead of read to the end.
+        """
+        if response.content.is_eof():
+            await response.content.read()
+        else:
+            response.close()
+
+    def capture_response(self, url: str, status: int, body: bytes) -> None:
+        """Keep a raw response in the bounded capture buffer."""
+        self.raw_responses.append(
+            {
+                "time": datetime.datetime.now(datetime.UTC).isoformat(),
+                "url": url,
+                "status": status,
+                "response": body,
+            }
+        )
+
+    def get_raw_responses(self) -> list[dict]:
+        """Return the captured responses decoded, credentials redacted."""
+        responses = []
+        for captured in self.raw_responses:
+            response_text = captured["response"].decode("utf-8", errors="replace")
+            for secret in (self.password, self.username):
+                if secret:
+                    response_text = response_text.replace(secret, "**REDACTED**")
+            responses.append({**captured, "response": response_text})
+        return responses
+
+    @staticmethod
+    def extract_data(raw_response: str) -> dict:
+        """Extract data from HTML code."""
+        _LOGGER.debug("Extracting data from HTML code")
+        return extract_data(raw_response)
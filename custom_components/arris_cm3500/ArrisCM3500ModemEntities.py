@@ -1,96 +1,94 @@
 """Arris CM3500 Entities."""
 
+from dataclasses import dataclass
 import logging
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.helpers.entity import EntityCategory
 
-from .ArrisCM3500ModemDashboard import ArrisCM3500ModemDashboard
+from .ArrisCM3500ModemStats import COUNTERS, STAGES
+from .const import (
+    ANOMALY_METRICS,
+    CHANNEL_ID_KEYS,
+    CHANNEL_PREFIXES,
+    EMPTY_VALUES,
+    PAGE_SENSORS,
+    SLOW_TIER_FIELDS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class BaseEntity:
-    """Base class for all components."""
+@dataclass(frozen=True, kw_only=True)
+class ArrisCM3500SensorEntityDescription(SensorEntityDescription):
+    """Describes an Arris CM3500 sensor."""
 
-    modem: ArrisCM3500ModemDashboard
+    # Whether the modem data has a "<key>_attributes" dict of state attributes
+    attributes: bool = False
+    # Whether the sensor stays available once the modem data is stale
+    available_when_stale: bool = False
+    # Whether the channel metric is kept as hourly statistics in statistics mode
+    statistic: bool = False
+    # Whether the value is only refreshed on slow tier cycles
+    slow_tier: bool = False
 
-    def __init__(
-        self,
-        component,
-        attr: str,
-        name: str,
-        icon: str | None = None,
-        entity_type: EntityCategory | None = None,
-        device_class: str | None = None,
-        state_class: str | None = None,
-        display_precision: int | None = None,
-    ) -> None:
-        """Init."""
-        self.attr = attr
-        self.component = component
-        self.name = name
-        self.icon = icon
-        self.entity_type = entity_type
-        self.device_class = device_class
-        self.state_class = state_class
-        self.display_precision = display_precision
-
-    def setup(self, modem: ArrisCM3500ModemDashboard) -> bool:
-        """Set up entity if supported."""
-        self.modem = modem
-        if not self.is_supported:
-            _LOGGER.debug("%s %s is not supported", type(self).__name__, self.attr)
-            return False
-
-        _LOGGER.debug("%s %s is supported", type(self).__name__, self.attr)
-        return True
-
-    @property
-    def is_supported(self) -> bool:
-        """Check entity is supported."""
-        supported = "is_" + self.attr + "_supported"
-        if hasattr(self.modem, supported):
-            return getattr(self.modem, supported)
-        return False
-
-
-class Sensor(BaseEntity):
-    """Base class for sensor type entities."""
 
-    def __init__(
-        self,
-        attr: str,
-        name: str,
-        icon: str | None,
-        unit: str | None,
-        entity_type: EntityCategory | None = None,
-        device_class: SensorDeviceClass | None = None,
-        state_class: SensorStateClass | None = None,
-        display_precision: int | None = None,
-    ) -> None:
-        """Init."""
-        super().__init__(
-            component="sensor",
-            attr=attr,
-            name=name,
-            icon=icon,
-            entity_type=entity_type,
-            device_class=device_class,
-            state_class=state_class,
-            display_precision=display_precision,
-        )
-        self.unit = unit
+@dataclass(frozen=True, kw_only=True)
+class ArrisCM3500BinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes an Arris CM3500 binary sensor."""
+
+    attributes: bool = True
+
+
+# Descriptions created so far, equal descriptions are shared by all the modems
+DESCRIPTIONS = {}
+
+
+def is_padded(channel: dict, id_key: str) -> bool:
+    """Return true for a padded channel, which carries no real data."""
+    return all(
+        value in EMPTY_VALUES for field, value in channel.items() if field != id_key
+    )
 
 
-# Function to create sensors
-def create_sensors(modem):
+def merge_channel_layout(layout: dict | None, modem_data: dict) -> dict:
+    """Merge the channels and the fields carrying real data into the layout.
+
+    The layout maps each channel kind to its channel ids and, per channel, the
+    fields that have carried real data. Fields are never removed, so the layout
+    only changes when a new channel or field shows up.
+    """
+    merged = {kind: dict((layout or {}).get(kind, {})) for kind in CHANNEL_ID_KEYS}
+    for kind, id_key in CHANNEL_ID_KEYS.items():
+        channels = merged[kind]
+        for channel in modem_data.get(kind, []):
+            channel_id = str(channel.get(id_key))
+            fields = channels.get(channel_id, [])
+            new_fields = [
+                field
+                for field, value in channel.items()
+                if field != id_key and field not in fields and value not in EMPTY_VALUES
+            ]
+            if channel_id not in channels or new_fields:
+                channels[channel_id] = sorted([*fields, *new_fields])
+    return merged
+
+
+# Function to create sensors, channels without data are disabled by default
+def create_sensors(layout: dict[str, dict[str, list[str]]]):
     sensors = []
     #
     # Downstream_QAM
     #
-    for channel in modem.modem_data.get("Downstream_QAM", []):
-        dcid = channel.get("DCID")
+    for dcid in layout.get("Downstream_QAM", []):
         attributes = {
             "Frequency": {
                 "icon": "mdi:sine-wave",
@@ -132,21 +130,25 @@ def create_sensors(modem):
 
         for key, details in attributes.items():
             sensors.append(
-                Sensor(
-                    attr=f"dcid_{dcid}_{key.lower()}",
+                ArrisCM3500SensorEntityDescription(
+                    key=f"dcid_{dcid}_{key.lower()}",
                     name=f"DCID {dcid} {key.replace('_', ' ')}",
                     icon=details["icon"],
-                    unit=details["unit"],
+                    native_unit_of_measurement=details["unit"],
                     state_class=details["device_class"],
-                    display_precision=details["precision"],
+                    suggested_display_precision=details["precision"],
+                    statistic=details["device_class"] is not None,
+                    slow_tier=key in SLOW_TIER_FIELDS,
+                    entity_registry_enabled_default=bool(
+                        layout["Downstream_QAM"][dcid]
+                    ),
                 )
             )
 
     #
     # Upstream_QAM
     #
-    for channel in modem.modem_data.get("Upstream_QAM", []):
-        ucid = channel.get("UCID")
+    for ucid in layout.get("Upstream_QAM", []):
         attributes = {
             "Frequency": {
                 "icon": "mdi:sine-wave",
@@ -182,21 +184,23 @@ def create_sensors(modem):
 
         for key, details in attributes.items():
             sensors.append(
-                Sensor(
-                    attr=f"ucid_{ucid}_{key.lower()}",
+                ArrisCM3500SensorEntityDescription(
+                    key=f"ucid_{ucid}_{key.lower()}",
                     name=f"UCID {ucid} {key.replace('_', ' ')}",
                     icon=details["icon"],
-                    unit=details["unit"],
+                    native_unit_of_measurement=details["unit"],
                     state_class=details["device_class"],
-                    display_precision=details["precision"],
+                    suggested_display_precision=details["precision"],
+                    statistic=details["device_class"] is not None,
+                    slow_tier=key in SLOW_TIER_FIELDS,
+                    entity_registry_enabled_default=bool(layout["Upstream_QAM"][ucid]),
                 )
             )
 
     #
     # Downstream_OFDM
     #
-    for channel in modem.modem_data.get("Downstream_OFDM", []):
-        dcid_ofdm = channel.get("DCID_OFDM")
+    for dcid_ofdm in layout.get("Downstream_OFDM", []):
         attributes = {
             "FFT_Type": {
                 "icon": "mdi:waveform",  # Represents frequency domain processing
@@ -250,21 +254,25 @@ def create_sensors(modem):
 
         for key, details in attributes.items():
             sensors.append(
-                Sensor(
-                    attr=f"dcid_ofdm_{dcid_ofdm}_{key.lower()}",
+                ArrisCM3500SensorEntityDescription(
+                    key=f"dcid_ofdm_{dcid_ofdm}_{key.lower()}",
                     name=f"DCID OFDM {dcid_ofdm} {key.replace('_', ' ')}",
                     icon=details["icon"],
-                    unit=details["unit"],
+                    native_unit_of_measurement=details["unit"],
                     state_class=details["device_class"],
-                    display_precision=details["precision"],
+                    suggested_display_precision=details["precision"],
+                    statistic=details["device_class"] is not None,
+                    slow_tier=key in SLOW_TIER_FIELDS,
+                    entity_registry_enabled_default=bool(
+                        layout["Downstream_OFDM"][dcid_ofdm]
+                    ),
                 )
             )
 
     #
     # Upstream_OFDM
     #
-    for channel in modem.modem_data.get("Upstream_OFDM", []):
-        ucid_ofdm = channel.get("UCID_OFDM")
+    for ucid_ofdm in layout.get("Upstream_OFDM", []):
         attributes = {
             "FFT_Type": {
                 "icon": "mdi:waveform",  # Represents frequency domain processing
@@ -318,23 +326,148 @@ def create_sensors(modem):
 
         for key, details in attributes.items():
             sensors.append(
-                Sensor(
-                    attr=f"ucid_ofdm_{ucid_ofdm}_{key.lower()}",
+                ArrisCM3500SensorEntityDescription(
+                    key=f"ucid_ofdm_{ucid_ofdm}_{key.lower()}",
                     name=f"UCID OFDM {ucid_ofdm} {key.replace('_', ' ')}",
                     icon=details["icon"],
-                    unit=details["unit"],
+                    native_unit_of_measurement=details["unit"],
                     state_class=details["device_class"],
-                    display_precision=details["precision"],
+                    suggested_display_precision=details["precision"],
+                    statistic=details["device_class"] is not None,
+                    slow_tier=key in SLOW_TIER_FIELDS,
+                    entity_registry_enabled_default=bool(
+                        layout["Upstream_OFDM"][ucid_ofdm]
+                    ),
                 )
             )
+
+    #
+    # Diagnostics
+    #
+    for stage in STAGES:
+        sensors.append(
+            ArrisCM3500SensorEntityDescription(
+                key=f"stats_{stage}_duration",
+                name=f"{stage.replace('_', ' ').capitalize()} duration",
+                icon="mdi:timer-outline",
+                native_unit_of_measurement="ms",
+                entity_category=EntityCategory.DIAGNOSTIC,
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=2,
+            )
+        )
+
+    for counter in COUNTERS:
+        sensors.append(
+            ArrisCM3500SensorEntityDescription(
+                key=f"stats_{counter}",
+                name=counter.replace("_", " ").capitalize(),
+                icon="mdi:counter",
+                native_unit_of_measurement="B"
+                if counter == "bytes_downloaded"
+                else "#",
+                entity_category=EntityCategory.DIAGNOSTIC,
+                state_class=SensorStateClass.MEASUREMENT,
+                suggested_display_precision=0,
+            )
+        )
+
+    sensors.append(
+        ArrisCM3500SensorEntityDescription(
+            key="last_sample",
+            name="Last sample",
+            icon="mdi:clock-check-outline",
+            device_class=SensorDeviceClass.TIMESTAMP,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            available_when_stale=True,
+        )
+    )
+
+    #
+    # Health
+    #
+    sensors.append(
+        ArrisCM3500SensorEntityDescription(
+            key="health_score",
+            name="Health score",
+            icon="mdi:heart-pulse",
+            native_unit_of_measurement="%",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=0,
+            attributes=True,
+        )
+    )
+
+    #
+    # Event log
+    #
+    sensors.append(
+        ArrisCM3500SensorEntityDescription(
+            key="critical_events_per_hour",
+            name="Critical events per hour",
+            icon="mdi:alert-octagon-outline",
+            native_unit_of_measurement="#",
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=0,
+        )
+    )
+
+    #
+    # Modem pages
+    #
+    for page_attr, (_, _, attributes) in PAGE_SENSORS.items():
+        sensors.append(
+            ArrisCM3500SensorEntityDescription(
+                key=page_attr,
+                name=page_attr.replace("_", " ").capitalize(),
+                icon="mdi:information-outline",
+                native_unit_of_measurement=None,
+                entity_category=EntityCategory.DIAGNOSTIC,
+                attributes=attributes,
+            )
+        )
     return sensors
 
 
+# Function to create the anomaly binary sensors, one per channel
+def create_binary_sensors(layout: dict[str, dict[str, list[str]]]):
+    binary_sensors = []
+    for kind in ANOMALY_METRICS:
+        prefix = CHANNEL_PREFIXES[kind]
+        for channel_id in layout.get(kind, []):
+            binary_sensors.append(
+                ArrisCM3500BinarySensorEntityDescription(
+                    key=f"{prefix}_{channel_id}_anomaly",
+                    name=f"{prefix.replace('_', ' ').upper()} {channel_id} anomaly",
+                    icon="mdi:chart-bell-curve",
+                    device_class=BinarySensorDeviceClass.PROBLEM,
+                    entity_registry_enabled_default=bool(layout[kind][channel_id]),
+                )
+            )
+    return binary_sensors
+
+
 class ArrisCM3500ModemEntities:
-    """Class for accessing the entities."""
+    """Class for accessing the entities.
+
+    In statistics mode the channel metrics are not entities, they are kept as
+    hourly statistics instead.
+    """
 
-    def __init__(self, modem) -> None:
+    def __init__(
+        self,
+        modem,
+        layout: dict[str, dict[str, list[str]]],
+        statistics_mode: bool = False,
+    ) -> None:
         """Initialize instruments."""
-        self.entities_list = [
-            entity for entity in create_sensors(modem) if entity.setup(modem)
-        ]
+        self.entities_list = []
+        self.statistics_list = []
+        for description in create_sensors(layout) + create_binary_sensors(layout):
+            if not getattr(modem, f"is_{description.key}_supported", False):
+                continue
+            description = DESCRIPTIONS.setdefault(description, description)
+            if statistics_mode and getattr(description, "statistic", False):
+                self.statistics_list.append(description)
+            else:
+                self.entities_list.append(description)
@@ -2,39 +2,35 @@
 
 import logging
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity import Entity, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-
 _LOGGER = logging.getLogger(__name__)
 
 
 class ArrisCM3500ModemEntity(CoordinatorEntity, Entity):
-    """Base class for all ArrisCM3500 entities."""
-
-    def __init__(
-        self,
-        config_entry: ConfigEntry,
-        coordinator: str,
-        attr: str,
-    ) -> None:
-        """Initialize ArrisCM3500 base entity."""
+    """Base class for all ArrisCM3500 entities.
 
-        super().__init__(coordinator)
+    Metadata comes from the shared entity description and the device info of
+    the coordinator, so an instance only holds its value.
+    """
 
-        self.config_entry = config_entry
-        self.coordinator = coordinator
-        self.attr = attr
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "Arris CM3500")},
-            "name": "Arris CM3500",
-            "model": "Arris CM3500",
-            "manufacturer": "Arris",
-        }
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, description: EntityDescription) -> None:
+        """Initialize ArrisCM3500 base entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self.attr = description.key
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+        self._attr_device_info = coordinator.device_info
 
     @property
     def available(self) -> bool:
-        """Return true if entity is supported."""
+        """Return true if entity is supported and the modem data is not stale."""
+        if self.coordinator.stale and not getattr(
+            self.entity_description, "available_when_stale", False
+        ):
+            return False
         return getattr(self.coordinator.modem, "is_" + self.attr + "_supported")
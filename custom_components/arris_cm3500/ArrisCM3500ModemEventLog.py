@@ -0,0 +1,75 @@
+"""Arris CM3500 Modem Event Log."""
+
+from collections import deque
+import logging
+from time import monotonic
+
+from .const import CRITICAL_EVENT_LEVELS, EVENT_LOG_BUFFER_SIZE, EVENT_TYPES
+from .ArrisCM3500ModemParser import event_key
+
+_LOGGER = logging.getLogger(__name__)
+
+# Window of the critical events counter, in seconds
+CRITICAL_EVENTS_WINDOW = 3600
+
+
+def event_type(entry: dict) -> str | None:
+    """Return the type of a known event, e.g. a T3 time-out."""
+    description = entry["description"].lower()
+    for name, keyword in EVENT_TYPES.items():
+        if keyword in description:
+            return name
+    return None
+
+
+def is_critical(entry: dict) -> bool:
+    """Return true for events of the emergency, alert and critical levels."""
+    level = entry["level"].lower()
+    return any(critical in level for critical in CRITICAL_EVENT_LEVELS)
+
+
+class ArrisCM3500ModemEventLog:
+    """Incremental ingestion of the event log."""
+
+    def __init__(self) -> None:
+        """Init ArrisCM3500ModemEventLog class."""
+        self.mark = None
+        self.pending = []
+        self.recent = deque(maxlen=EVENT_LOG_BUFFER_SIZE)
+        self.critical_times = deque()
+
+    def ingest(self, entries: list[dict]) -> None:
+        """Queue the entries newer than the high-water mark, then move the mark.
+
+        The parser only returns the entries newer than the mark, newest first.
+        The first ingestion only sets the mark, the existing log is not replayed.
+        """
+        if not entries:
+            return
+
+        baseline = self.mark is None
+        self.mark = event_key(entries[0])
+        if baseline:
+            _LOGGER.debug("Event log high-water mark set to %s", self.mark)
+            return
+
+        now = monotonic()
+        for entry in reversed(entries):
+            entry = {**entry, "type": event_type(entry), "critical": is_critical(entry)}
+            if entry["critical"]:
+                self.critical_times.append(now)
+            self.pending.append(entry)
+            self.recent.append(entry)
+
+    def pop_pending(self) -> list[dict]:
+        """Return the entries not handed out yet, oldest first."""
+        pending, self.pending = self.pending, []
+        return pending
+
+    @property
+    def critical_per_hour(self) -> int:
+        """Return the number of critical events ingested in the last hour."""
+        expired = monotonic() - CRITICAL_EVENTS_WINDOW
+        while self.critical_times and self.critical_times[0] < expired:
+            self.critical_times.popleft()
+        return len(self.critical_times)
@@ -0,0 +1,95 @@
+"""Arris CM3500 Modem Health."""
+
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+
+from .ArrisCM3500ModemEntities import is_padded
+from .const import (
+    CHANNEL_ID_KEYS,
+    CHANNEL_PREFIXES,
+    CONF_DS_POWER_LIMIT,
+    CONF_MIN_RXMER,
+    CONF_MIN_SNR,
+    CONF_US_POWER_MAX,
+    CONF_US_POWER_MIN,
+    DEFAULT_DS_POWER_LIMIT,
+    DEFAULT_MIN_RXMER,
+    DEFAULT_MIN_SNR,
+    DEFAULT_US_POWER_MAX,
+    DEFAULT_US_POWER_MIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def health_thresholds(config_entry: ConfigEntry) -> dict:
+    """Return the allowed range of each checked field, per channel kind."""
+    options = config_entry.options
+    ds_power = options.get(CONF_DS_POWER_LIMIT, DEFAULT_DS_POWER_LIMIT)
+    us_power = (
+        options.get(CONF_US_POWER_MIN, DEFAULT_US_POWER_MIN),
+        options.get(CONF_US_POWER_MAX, DEFAULT_US_POWER_MAX),
+    )
+    return {
+        "Downstream_QAM": {
+            "Power": (-ds_power, ds_power),
+            "SNR": (options.get(CONF_MIN_SNR, DEFAULT_MIN_SNR), None),
+        },
+        "Upstream_QAM": {"Power": us_power},
+        "Downstream_OFDM": {
+            "RxMER_Data": (options.get(CONF_MIN_RXMER, DEFAULT_MIN_RXMER), None)
+        },
+        "Upstream_OFDM": {"Tx_Power": us_power},
+    }
+
+
+class ArrisCM3500ModemHealth:
+    """DOCSIS spec compliance of the channels, scored once per poll."""
+
+    def __init__(self, thresholds: dict) -> None:
+        """Init ArrisCM3500ModemHealth class."""
+        self.thresholds = thresholds
+        self.score = None
+        self.channels = {}
+
+    def update(self, modem_data: dict) -> None:
+        """Score each channel and the modem from the parsed channel records.
+
+        A channel scores the percentage of its checks in range, the modem the
+        percentage of all checks in range.
+        """
+        channels = {}
+        passed = checks = 0
+        for kind, limits in self.thresholds.items():
+            id_key = CHANNEL_ID_KEYS[kind]
+            for channel in modem_data.get(kind, []):
+                if is_padded(channel, id_key):
+                    continue
+
+                issues = []
+                channel_checks = 0
+                for field, (low, high) in limits.items():
+                    try:
+                        value = float(channel[field])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    channel_checks += 1
+                    if low is not None and value < low:
+                        issues.append(f"{field} {value} below {low}")
+                    elif high is not None and value > high:
+                        issues.append(f"{field} {value} above {high}")
+
+                if not channel_checks:
+                    continue
+                checks += channel_checks
+                passed += channel_checks - len(issues)
+                channels[f"{CHANNEL_PREFIXES[kind]}_{channel[id_key]}"] = {
+                    "score": round(
+                        100 * (channel_checks - len(issues)) / channel_checks
+                    ),
+                    "issues": issues,
+                }
+
+        self.score = round(100 * passed / checks) if checks else None
+        self.channels = channels
@@ -0,0 +1,138 @@
+"""Arris CM3500 Modem Metrics."""
+
+import datetime
+import logging
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+
+from .ArrisCM3500ModemEntities import is_padded
+from .const import (
+    CHANNEL_ID_KEYS,
+    COORDINATOR,
+    DOMAIN,
+    METRICS_URL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE_OPENMETRICS = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Metric family of each channel field: name, type and help text
+METRIC_FAMILIES = {
+    "Frequency": ("frequency_mhz", "gauge", "Center frequency in MHz"),
+    "Power": ("power_dbmv", "gauge", "Power level in dBmV"),
+    "SNR": ("snr_db", "gauge", "Signal to noise ratio in dB"),
+    "Correcteds": ("correcteds", "counter", "Corrected codewords"),
+    "Uncorrectables": ("uncorrectables", "counter", "Uncorrectable codewords"),
+    "Symbol_Rate": ("symbol_rate_ksyms", "gauge", "Symbol rate in kSym/s"),
+    "Channel_Width": ("channel_width_mhz", "gauge", "Channel width in MHz"),
+    "Active_Subcarriers": ("active_subcarriers", "gauge", "Active subcarriers"),
+    "First_Subcarrier": ("first_subcarrier", "gauge", "First active subcarrier"),
+    "Last_Subcarrier": ("last_subcarrier", "gauge", "Last active subcarrier"),
+    "RxMER_Pilot": ("rxmer_pilot_db", "gauge", "Pilot RxMER in dB"),
+    "RxMER_PLC": ("rxmer_plc_db", "gauge", "PLC RxMER in dB"),
+    "RxMER_Data": ("rxmer_data_db", "gauge", "Data RxMER in dB"),
+    "Lower_Frequency": ("lower_frequency_mhz", "gauge", "Lower frequency in MHz"),
+    "Upper_Frequency": ("upper_frequency_mhz", "gauge", "Upper frequency in MHz"),
+    "Tx_Power": ("tx_power_dbmv", "gauge", "Transmit power in dBmV"),
+}
+LAST_SAMPLE_FAMILY = (
+    "last_sample_timestamp_seconds",
+    "gauge",
+    "Time of the last successful fetch",
+)
+
+
+def label_value(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ArrisCM3500ModemMetrics:
+    """OpenMetrics samples of the last poll of a modem, rendered once per refresh."""
+
+    def __init__(self, modem: str) -> None:
+        """Init ArrisCM3500ModemMetrics class."""
+        self.modem = label_value(modem)
+        self.modem_data = {}
+        self.sampled_at = None
+        self._samples = None
+
+    def update(self, modem_data: dict, sampled_at: datetime.datetime) -> None:
+        """Keep the data of a new poll, the samples are rendered on the next scrape."""
+        self.modem_data = modem_data
+        self.sampled_at = sampled_at
+        self._samples = None
+
+    @property
+    def samples(self) -> dict[str, str]:
+        """Return the sample lines of the modem by metric family."""
+        if self._samples is None:
+            self._samples = self._render()
+        return self._samples
+
+    def _render(self) -> dict[str, str]:
+        lines = {}
+        for kind, id_key in CHANNEL_ID_KEYS.items():
+            direction, modulation = kind.lower().split("_")
+            for channel in self.modem_data.get(kind, []):
+                if is_padded(channel, id_key):
+                    continue
+
+                labels = (
+                    f'modem="{self.modem}",direction="{direction}",'
+                    f'kind="{modulation}",channel="{label_value(str(channel[id_key]))}"'
+                )
+                for field, value in channel.items():
+                    if (family := METRIC_FAMILIES.get(field)) is None:
+                        continue
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        continue
+                    name, metric_type, _ = family
+                    suffix = "_total" if metric_type == "counter" else ""
+                    lines.setdefault(name, []).append(
+                        f"{DOMAIN}_{name}{suffix}{{{labels}}} {value}"
+                    )
+
+        if self.sampled_at is not None:
+            lines[LAST_SAMPLE_FAMILY[0]] = [
+                f'{DOMAIN}_{LAST_SAMPLE_FAMILY[0]}{{modem="{self.modem}"}} '
+                f"{self.sampled_at.timestamp()}"
+            ]
+        return {name: "\n".join(samples) + "\n" for name, samples in lines.items()}
+
+
+class ArrisCM3500ModemMetricsView(HomeAssistantView):
+    """Serve the channel data of all the modems as OpenMetrics text."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics of the last poll of each modem."""
+        hass = request.app[KEY_HASS]
+        modems = [
+            entry_data[COORDINATOR].metrics.samples
+            for entry_data in hass.data.get(DOMAIN, {}).values()
+        ]
+
+        body = []
+        for name, metric_type, help_text in (
+            *METRIC_FAMILIES.values(),
+            LAST_SAMPLE_FAMILY,
+        ):
+            samples = [modem[name] for modem in modems if name in modem]
+            if samples:
+                body.append(f"# TYPE {DOMAIN}_{name} {metric_type}\n")
+                body.append(f"# HELP {DOMAIN}_{name} {help_text}\n")
+                body.extend(samples)
+        body.append("# EOF\n")
+
+        return web.Response(
+            body="".join(body).encode(),
+            headers={"Content-Type": CONTENT_TYPE_OPENMETRICS},
+        )
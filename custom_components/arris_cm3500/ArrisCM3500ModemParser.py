@@ -0,0 +1,491 @@
+"""Arris CM3500 Modem Parser."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from html.parser import HTMLParser
+import logging
+import re
+import zlib
+
+_LOGGER = logging.getLogger(__name__)
+
+# Downstream QAM, Downstream OFDM, Upstream QAM and Upstream OFDM
+CHANNEL_TABLES = 4
+
+# Field of each channel table header label, labels lowercased without units
+COLUMN_FIELDS = {
+    "dcid": "DCID",
+    "ucid": "UCID",
+    "freq": "Frequency",
+    "power": "Power",
+    "snr": "SNR",
+    "modulation": "Modulation",
+    "correcteds": "Correcteds",
+    "uncorrectables": "Uncorrectables",
+    "channel type": "Channel_Type",
+    "symbol rate": "Symbol_Rate",
+    "fft type": "FFT_Type",
+    "channel width": "Channel_Width",
+    "of active subcarriers": "Active_Subcarriers",
+    "first active subcarrier": "First_Subcarrier",
+    "last active subcarrier": "Last_Subcarrier",
+    "rxmer pilot": "RxMER_Pilot",
+    "rxmer plc": "RxMER_PLC",
+    "rxmer data": "RxMER_Data",
+    "lower frequency": "Lower_Frequency",
+    "upper frequency": "Upper_Frequency",
+    "tx power": "Tx_Power",
+}
+# Fields kept as text, the others are numbers
+TEXT_FIELDS = ("DCID", "UCID", "Modulation", "Channel_Type", "FFT_Type")
+# Channel id field and fields identifying each channel table. The OFDM tables
+# have no id column, their id is the number of the row label.
+TABLE_KINDS = {
+    "Downstream_QAM": ("DCID", ("DCID", "SNR")),
+    "Upstream_QAM": ("UCID", ("UCID", "Channel_Type")),
+    "Downstream_OFDM": ("DCID_OFDM", ("FFT_Type", "RxMER_Data")),
+    "Upstream_OFDM": ("UCID_OFDM", ("FFT_Type", "Tx_Power")),
+}
+
+
+# Time formats of the event log entries
+EVENT_TIME_FORMATS = (
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%a %b %d %H:%M:%S %Y",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+
+def clean_value(value: str) -> float:
+    cleaned_value = re.sub(r"[^\d.-]", "", value)
+    return cleaned_value if cleaned_value else 0
+
+
+@dataclass(frozen=True, slots=True)
+class TableSchema:
+    """Column layout of a channel table, read from its header row."""
+
+    kind: str
+    header: tuple[str, ...]
+    # Cell index, field and whether the value is a number
+    columns: tuple[tuple[int, str, bool], ...]
+
+    @property
+    def id_field(self) -> str:
+        """Return the channel id field of the table."""
+        return TABLE_KINDS[self.kind][0]
+
+
+def header_label(cell: str) -> str:
+    """Return a header cell lowercased, without units and punctuation."""
+    return " ".join(
+        re.sub(r"[^a-z ]", "", re.sub(r"\(.*?\)", "", cell.lower())).split()
+    )
+
+
+def detect_schema(cells: list[str]) -> TableSchema | None:
+    """Return the schema of a channel table from its header row, if it is one."""
+    columns = []
+    for index, cell in enumerate(cells):
+        if (field := COLUMN_FIELDS.get(header_label(cell))) is not None:
+            columns.append((index, field, field not in TEXT_FIELDS))
+    if len(columns) < 2:
+        return None
+
+    fields = {field for _, field, _ in columns}
+    for kind, (id_field, required) in TABLE_KINDS.items():
+        if fields.issuperset(required):
+            if id_field not in fields:
+                columns.insert(0, (0, id_field, True))
+            return TableSchema(kind, tuple(cells), tuple(columns))
+    return None
+
+
+class TableParser(HTMLParser, ABC):
+    """Incremental parser handing the cells of each table row to parse_row."""
+
+    def __init__(self) -> None:
+        """Init TableParser class."""
+        super().__init__(convert_charrefs=True)
+        self.rows_parsed = 0
+        self.tables_started = 0
+        # One entry per open table: position in the page, matching rows found,
+        # open row cells, open cell
+        self._tables = []
+
+    @property
+    def done(self) -> bool:
+        """Return true once the rest of the page is not needed."""
+        return False
+
+    @abstractmethod
+    def parse_row(self, cells: list[str]) -> bool:
+        """Parse a table row, return true if it matched."""
+
+    @property
+    def table_position(self) -> int:
+        """Return the position in the page of the table being parsed."""
+        return self._tables[-1]["position"]
+
+    def end_table(self, matched: bool) -> None:
+        """Handle the end of a table."""
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag == "table":
+            self._tables.append(
+                {
+                    "position": self.tables_started,
+                    "matched": False,
+                    "cells": None,
+                    "cell": None,
+                }
+            )
+            self.tables_started += 1
+            return
+        if not self._tables:
+            return
+
+        table = self._tables[-1]
+        if tag == "tr":
+            self._end_row(table)
+            table["cells"] = []
+        elif tag == "td" and table["cells"] is not None:
+            self._end_cell(table)
+            table["cell"] = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self._tables:
+            return
+
+        table = self._tables[-1]
+        if tag == "td":
+            self._end_cell(table)
+        elif tag == "tr":
+            self._end_row(table)
+        elif tag == "table":
+            self._end_row(table)
+            self.end_table(self._tables.pop()["matched"])
+
+    def handle_data(self, data: str) -> None:
+        if self._tables and self._tables[-1]["cell"] is not None:
+            self._tables[-1]["cell"].append(data)
+
+    def _end_cell(self, table: dict) -> None:
+        if table["cell"] is not None:
+            table["cells"].append("".join(table["cell"]).strip())
+            table["cell"] = None
+
+    def _end_row(self, table: dict) -> None:
+        if table["cells"] is None:
+            return
+
+        self._end_cell(table)
+        cells = table["cells"]
+        table["cells"] = None
+        self.rows_parsed += 1
+        if self.parse_row(cells):
+            table["matched"] = True
+
+
+class ArrisCM3500ModemParser(TableParser):
+    """Incremental parser for the channel tables of the status page.
+
+    Rows are read by column from the schema of their table, found from the
+    header row. Given the schemas of a previous page, a table header is only
+    compared with the cached one. Tables without a known header fall back to
+    the row heuristics of parse_legacy_row.
+    """
+
+    def __init__(self, schemas: dict[int, TableSchema] | None = None) -> None:
+        """Init ArrisCM3500ModemParser class."""
+        super().__init__()
+        self.cached_schemas = schemas or {}
+        # Schemas of the tables of this page, by table position
+        self.schemas = {}
+        self.response = {
+            "Downstream_QAM": [],
+            "Downstream_OFDM": [],
+            "Upstream_QAM": [],
+            "Upstream_OFDM": [],
+        }
+        self.channel_tables = 0
+
+    @property
+    def done(self) -> bool:
+        """Return true once all the channel tables have been parsed."""
+        return self.channel_tables >= CHANNEL_TABLES
+
+    def end_table(self, matched: bool) -> None:
+        if matched:
+            self.channel_tables += 1
+
+    def parse_row(self, cells: list[str]) -> bool:
+        """Add a table row to the response, return true if it is a channel row."""
+        position = self.table_position
+        if (schema := self.schemas.get(position)) is not None:
+            return self.parse_schema_row(schema, cells)
+
+        cached = self.cached_schemas.get(position)
+        if cached is not None and cached.header == tuple(cells):
+            self.schemas[position] = cached
+            return False
+        if (schema := detect_schema(cells)) is not None:
+            _LOGGER.debug("Found %s table at position %d", schema.kind, position)
+            self.schemas[position] = schema
+            return False
+        return self.parse_legacy_row(cells)
+
+    def parse_schema_row(self, schema: TableSchema, cells: list[str]) -> bool:
+        """Add a row of a table with a known schema, skip the empty rows."""
+        if len(cells) != len(schema.header):
+            return False
+        channel = {
+            field: clean_value(cells[index]) if number else cells[index]
+            for index, field, number in schema.columns
+        }
+        if channel[schema.id_field] in ("", 0):
+            return False
+        self.response[schema.kind].append(channel)
+        return True
+
+    def parse_legacy_row(self, cells: list[str]) -> bool:
+        """Add a channel row found by its cell count and values."""
+        found = False
+        if len(cells) == 9:
+            cell0, cell1, cell2, cell3, cell4, cell5, cell6, cell7, cell8 = cells
+
+            if "QAM" in cell5:
+                found = True
+                self.response["Downstream_QAM"].append(
+                    {
+                        "DCID": cell1,
+                        "Frequency": clean_value(cell2),
+                        "Power": clean_value(cell3),
+                        "SNR": clean_value(cell4),
+                        "Modulation": cell5,
+                        "Correcteds": clean_value(cell7),
+                        "Uncorrectables": clean_value(cell8),
+                    }
+                )
+
+            if "4K" in cell1:
+                found = True
+                self.response["Downstream_OFDM"].append(
+                    {
+                        "DCID_OFDM": clean_value(cell0),
+                        "FFT_Type": cell1,
+                        "Channel_Width": clean_value(cell2),
+                        "Active_Subcarriers": clean_value(cell3),
+                        "First_Subcarrier": clean_value(cell4),
+                        "Last_Subcarrier": clean_value(cell5),
+                        "RxMER_Pilot": clean_value(cell6),
+                        "RxMER_PLC": clean_value(cell7),
+                        "RxMER_Data": clean_value(cell8),
+                    }
+                )
+
+            if "2K" in cell1:
+                found = True
+                self.response["Upstream_OFDM"].append(
+                    {
+                        "UCID_OFDM": clean_value(cell0),
+                        "FFT_Type": cell1,
+                        "Channel_Width": clean_value(cell2),
+                        "Active_Subcarriers": clean_value(cell3),
+                        "First_Subcarrier": clean_value(cell4),
+                        "Last_Subcarrier": clean_value(cell5),
+                        "Lower_Frequency": clean_value(cell6),
+                        "Upper_Frequency": clean_value(cell7),
+                        "Tx_Power": clean_value(cell8),
+                    }
+                )
+
+        if len(cells) == 7:
+            cell1, cell2, cell3, cell4, cell5, cell6 = cells[1:]
+
+            if "ATDMA" in cell4:
+                found = True
+                self.response["Upstream_QAM"].append(
+                    {
+                        "UCID": cell1,
+                        "Frequency": clean_value(cell2),
+                        "Power": clean_value(cell3),
+                        "Channel_Type": cell4,
+                        "Symbol_Rate": clean_value(cell5),
+                        "Modulation": cell6,
+                    }
+                )
+
+        return found
+
+    def result(self) -> dict:
+        """Return the parsed channels, missing channels added with default values."""
+        response = self.response
+
+        for dcid in range(1, 33):
+            if not any(ch["DCID"] == str(dcid) for ch in response["Downstream_QAM"]):
+                response["Downstream_QAM"].append(
+                    {
+                        "DCID": str(dcid),
+                        "Frequency": 0,
+                        "Power": 0,
+                        "SNR": 0,
+                        "Modulation": "N/A",
+                        "Correcteds": 0,
+                        "Uncorrectables": 0,
+                    }
+                )
+
+        for ucid in range(1, 9):
+            if not any(ch["UCID"] == str(ucid) for ch in response["Upstream_QAM"]):
+                response["Upstream_QAM"].append(
+                    {
+                        "UCID": str(ucid),
+                        "Frequency": 0,
+                        "Power": 0,
+                        "Channel_Type": "N/A",
+                        "Symbol_Rate": 0,
+                        "Modulation": "N/A",
+                    }
+                )
+
+        for dcid_ofdm in range(1, 3):
+            if not any(
+                ch["DCID_OFDM"] == str(dcid_ofdm) for ch in response["Downstream_OFDM"]
+            ):
+                response["Downstream_OFDM"].append(
+                    {
+                        "DCID_OFDM": str(dcid_ofdm),
+                        "FFT_Type": "N/A",
+                        "Channel_Width": 0,
+                        "Active_Subcarriers": 0,
+                        "First_Subcarrier": 0,
+                        "Last_Subcarrier": 0,
+                        "RxMER_Pilot": 0,
+                        "RxMER_PLC": 0,
+                        "RxMER_Data": 0,
+                    }
+                )
+
+        for ucid_ofdm in range(0, 2):
+            if not any(
+                ch["UCID_OFDM"] == str(ucid_ofdm) for ch in response["Upstream_OFDM"]
+            ):
+                response["Upstream_OFDM"].append(
+                    {
+                        "UCID_OFDM": str(ucid_ofdm),
+                        "FFT_Type": "N/A",
+                        "Channel_Width": 0,
+                        "Active_Subcarriers": 0,
+                        "First_Subcarrier": 0,
+                        "Last_Subcarrier": 0,
+                        "Lower_Frequency": 0,
+                        "Upper_Frequency": 0,
+                        "Tx_Power": 0,
+                    }
+                )
+
+        return response
+
+
+class KeyValueParser(TableParser):
+    """Parser for the label/value tables of the system and status pages."""
+
+    def __init__(self) -> None:
+        """Init KeyValueParser class."""
+        super().__init__()
+        self.values = {}
+
+    def parse_row(self, cells: list[str]) -> bool:
+        if len(cells) == 2 and cells[0]:
+            self.values[cells[0].rstrip(":").strip()] = cells[1]
+            return True
+        return False
+
+    def result(self) -> dict:
+        return self.values
+
+
+def event_key(entry: dict) -> tuple[str, int]:
+    """Return the high-water mark of an event log entry: time and message hash."""
+    return entry["time"], zlib.crc32(entry["description"].encode())
+
+
+def event_time(entry: dict) -> datetime | None:
+    """Return the time of an event log entry, None if it has no valid time."""
+    for time_format in EVENT_TIME_FORMATS:
+        try:
+            return datetime.strptime(entry["time"], time_format)
+        except ValueError:
+            continue
+    return None
+
+
+class EventLogParser(TableParser):
+    """Parser for the event log table.
+
+    The order of the log is found from the times of its entries. Given the
+    high-water mark of the newest entry seen before, only the newer entries are
+    returned, and parsing stops at the mark when the log is newest first.
+    """
+
+    def __init__(self, mark: tuple[str, int] | None = None) -> None:
+        """Init EventLogParser class."""
+        super().__init__()
+        self.mark = mark
+        self.entries = []
+        self.mark_index = None
+        self.first_time = None
+        # None until two entries with different times have been parsed
+        self.newest_first = None
+
+    @property
+    def done(self) -> bool:
+        """Return true once the mark has been reached in a newest first log."""
+        return self.mark_index is not None and self.newest_first is True
+
+    def parse_row(self, cells: list[str]) -> bool:
+        # Date Time, Event ID, Event Level, Description; skip the header row.
+        # Entries logged before the modem got the time have no valid time
+        # ("Time Not Established") and are kept
+        if self.done or len(cells) != 4 or cells[0] == "Date Time":
+            return False
+
+        entry = {
+            "time": cells[0],
+            "id": cells[1],
+            "level": cells[2],
+            "description": cells[3],
+        }
+        if self.newest_first is None and (time := event_time(entry)) is not None:
+            if self.first_time is None:
+                self.first_time = time
+            elif time != self.first_time:
+                self.newest_first = time < self.first_time
+        if self.mark_index is None and event_key(entry) == self.mark:
+            self.mark_index = len(self.entries)
+        self.entries.append(entry)
+        return True
+
+    def result(self) -> list[dict]:
+        """Return the entries newer than the mark, newest first."""
+        entries = self.entries
+        mark_index = self.mark_index
+        if self.newest_first is False:
+            entries = entries[::-1]
+            if mark_index is not None:
+                mark_index = len(entries) - 1 - mark_index
+        return entries if mark_index is None else entries[:mark_index]
+
+
+def extract_data(raw_response: str, schemas: dict | None = None) -> dict:
+    """Extract data from HTML code."""
+    parser = ArrisCM3500ModemParser(schemas)
+    try:
+        parser.feed(raw_response)
+        parser.close()
+    except Exception as error:
+        _LOGGER.error("Error during the raw data conversion, error %s", error)
+    return parser.result()
@@ -0,0 +1,102 @@
+"""Arris CM3500 Modem Statistics."""
+
+import datetime
+import logging
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, PENDING_STATISTICS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ArrisCM3500ModemStatistics:
+    """Hourly min/mean/max of the channel metrics, imported as statistics.
+
+    Samples are aggregated in memory; once a sample of the next hour comes in,
+    the finished hour is added in one batch per metric as the external
+    statistic "arris_cm3500:<entry id>_<key>". When Home Assistant stops the
+    unfinished hour is imported; on unload it is imported too and its samples
+    are kept, so the next setup completes the hour.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, config_entry: ConfigEntry, descriptions: list
+    ) -> None:
+        """Init ArrisCM3500ModemStatistics class."""
+        self.hass = hass
+        self.entry_id = config_entry.entry_id
+        self.host = config_entry.data[CONF_HOST]
+        self.descriptions = descriptions
+        # Minimum, maximum, total and count of the samples of the hour, by key
+        self.hour, self.samples = hass.data.get(PENDING_STATISTICS, {}).pop(
+            self.entry_id, (None, {})
+        )
+
+    @callback
+    def add(self, sampled_at: datetime.datetime, modem) -> None:
+        """Add the metrics of a poll, import the previous hour once it is over."""
+        hour = sampled_at.replace(minute=0, second=0, microsecond=0)
+        if self.hour is not None and hour != self.hour:
+            self.async_import()
+            self.samples = {}
+        self.hour = hour
+
+        for description in self.descriptions:
+            try:
+                value = float(getattr(modem, description.key))
+            except (TypeError, ValueError):
+                continue
+            if (samples := self.samples.get(description.key)) is None:
+                self.samples[description.key] = [value, value, value, 1]
+                continue
+            samples[0] = min(samples[0], value)
+            samples[1] = max(samples[1], value)
+            samples[2] += value
+            samples[3] += 1
+
+    @callback
+    def async_unload(self) -> None:
+        """Import the unfinished hour and keep its samples for the next setup."""
+        if not self.samples:
+            return
+        self.async_import()
+        self.hass.data.setdefault(PENDING_STATISTICS, {})[self.entry_id] = (
+            self.hour,
+            self.samples,
+        )
+
+    @callback
+    def async_import(self) -> None:
+        """Add the statistics of the aggregated hour to the recorder."""
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.warning("The recorder is not loaded, statistics are dropped")
+            return
+
+        _LOGGER.debug("Importing the statistics of %d metrics", len(self.samples))
+        for description in self.descriptions:
+            if (metric := self.samples.get(description.key)) is None:
+                continue
+            minimum, maximum, total, count = metric
+            async_add_external_statistics(
+                self.hass,
+                StatisticMetaData(
+                    has_mean=True,
+                    has_sum=False,
+                    name=f"Arris CM3500 {self.host} {description.name}",
+                    source=DOMAIN,
+                    statistic_id=(
+                        f"{DOMAIN}:{self.entry_id.lower()}_{description.key}"
+                    ),
+                    unit_of_measurement=description.native_unit_of_measurement,
+                ),
+                [
+                    StatisticData(
+                        start=self.hour, min=minimum, mean=total / count, max=maximum
+                    )
+                ],
+            )
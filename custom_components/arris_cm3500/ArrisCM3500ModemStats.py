@@ -0,0 +1,65 @@
+"""Arris CM3500 Modem Stats."""
+
+import logging
+from time import perf_counter
+
+_LOGGER = logging.getLogger(__name__)
+
+STAGES = ("login", "status_fetch", "parse", "dashboard", "state_write")
+COUNTERS = ("bytes_downloaded", "rows_parsed", "entities_written")
+
+
+class StageTimer:
+    """Context manager recording the duration of one stage."""
+
+    __slots__ = ("durations", "stage", "start")
+
+    def __init__(self, durations: dict, stage: str) -> None:
+        """Init StageTimer class."""
+        self.durations = durations
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self) -> "StageTimer":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.durations[self.stage] = round((perf_counter() - self.start) * 1000, 2)
+
+
+class ArrisCM3500ModemStats:
+    """Per-poll stage timings (ms) and counters."""
+
+    def __init__(self) -> None:
+        """Init ArrisCM3500ModemStats class."""
+        self.durations = dict.fromkeys(STAGES, 0.0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def measure(self, stage: str) -> StageTimer:
+        """Return a timer recording the duration of the given stage."""
+        return StageTimer(self.durations, stage)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record a duration measured outside of a timer."""
+        self.durations[stage] = round(seconds * 1000, 2)
+
+    def count(self, counter: str, value: int = 1) -> None:
+        """Increase a counter."""
+        self.counters[counter] += value
+
+    def reset(self, *counters: str) -> None:
+        """Reset the given counters, or all of them."""
+        for counter in counters or COUNTERS:
+            self.counters[counter] = 0
+
+    def log_summary(self) -> None:
+        """Log a one-line summary of the last poll."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Poll stats: %s",
+                ", ".join(
+                    [f"{stage}={value}ms" for stage, value in self.durations.items()]
+                    + [f"{counter}={value}" for counter, value in self.counters.items()]
+                ),
+            )
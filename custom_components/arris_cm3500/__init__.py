@@ -5,30 +5,68 @@ from __future__ import annotations
 from datetime import timedelta
 import logging
 import asyncio
+from time import monotonic
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    CONF_ANOMALY_SIGMA,
+    CONF_FAST_START,
+    CONF_MAX_DATA_AGE,
+    CONF_SLOW_TIER_CYCLES,
+    CONF_STATISTICS_MODE,
+    CONF_UPDATE_INTERVAL,
     COORDINATOR,
     DATA_LISTENER,
+    DEFAULT_ANOMALY_SIGMA,
+    DEFAULT_FAST_START,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_SLOW_TIER_CYCLES,
+    DEFAULT_STATISTICS_MODE,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    EVENT_ANOMALY,
+    EVENT_MODEM_LOG,
     MAX_RETRIES,
+    METRICS_VIEW,
+    PENDING_STATISTICS,
+    REFRESH_MIN_INTERVAL,
     RETRY_DELAY,
+    SERVICE_REFRESH,
+    STORAGE_VERSION,
+    VALIDATED_MODEMS,
 )
-from .ArrisCM3500ModemData import ArrisCM3500ModemData
+from .ArrisCM3500ModemAnomalies import ArrisCM3500ModemAnomalies
+from .ArrisCM3500ModemData import ArrisCM3500ModemData, ArrisCM3500ModemStatus
 from .ArrisCM3500ModemDashboard import ArrisCM3500ModemDashboard
-from .ArrisCM3500ModemEntities import ArrisCM3500ModemEntities
+from .ArrisCM3500ModemHealth import ArrisCM3500ModemHealth, health_thresholds
+from .ArrisCM3500ModemMetrics import (
+    ArrisCM3500ModemMetrics,
+    ArrisCM3500ModemMetricsView,
+)
+from .ArrisCM3500ModemStatistics import ArrisCM3500ModemStatistics
+from .ArrisCM3500ModemEntities import ArrisCM3500ModemEntities, merge_channel_layout
 
 _LOGGER = logging.getLogger(__name__)
 
 # List of platforms to support. There should be a matching .py file for each,
 # eg <cover.py> and <sensor.py>
-PLATFORMS: list[str] = ["sensor"]
+PLATFORMS: list[str] = ["binary_sensor", "sensor"]
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -36,18 +74,53 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
 
     hass.data.setdefault(DOMAIN, {})
 
-    update_interval = timedelta(minutes=DEFAULT_UPDATE_INTERVAL)
+    update_interval = timedelta(
+        minutes=config_entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    )
 
+    async_migrate_device(hass, config_entry)
+    await async_migrate_entities(hass, config_entry)
     coordinator = ArrisCM3500ModemCoordinator(hass, config_entry, update_interval)
 
-    await coordinator.async_refresh()
+    # The stored channel layout is always loaded so channels missing from the
+    # first fetch keep their entities. Fast start creates the entities from it
+    # and fetches the modem data in the background
+    has_layout = await coordinator.async_load_layout()
+    fast_start = (
+        config_entry.options.get(CONF_FAST_START, DEFAULT_FAST_START) and has_layout
+    )
+    if fast_start:
+        coordinator.create_layout_entities()
+    else:
+        await coordinator.async_refresh()
 
     hass.data[DOMAIN][config_entry.entry_id] = {
         COORDINATOR: coordinator,
+        DATA_LISTENER: config_entry.add_update_listener(async_reload_entry),
     }
+    # Restored values go stale too when the modem stays unreachable
+    coordinator.async_schedule_stale()
+    config_entry.async_on_unload(coordinator.async_cancel_stale)
+    config_entry.async_on_unload(coordinator.async_unload_statistics)
+    # Config entries are not unloaded at shutdown, import before the recorder stops
+    config_entry.async_on_unload(
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, coordinator.async_stop_statistics
+        )
+    )
+    async_setup_services(hass)
+
+    if not hass.data.get(METRICS_VIEW):
+        hass.http.register_view(ArrisCM3500ModemMetricsView())
+        hass.data[METRICS_VIEW] = True
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    if fast_start:
+        config_entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+
     return True
 
 
@@ -62,9 +135,96 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if entry.entry_id in hass.data[DOMAIN]:
             hass.data[DOMAIN].pop(entry.entry_id)
 
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_REFRESH)
+
     return unload_ok
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when the options change."""
+    # A data only update comes from the reauth flow, which reloads the entry
+    # itself, a second reload would drop the session it hands over
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data and entry_data[COORDINATOR].options == entry.options:
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored channel layout of a config entry."""
+    hass.data.get(PENDING_STATISTICS, {}).pop(entry.entry_id, None)
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
+@callback
+def async_migrate_device(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Key the device shared by all the modems before by the config entry id."""
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, "Arris CM3500")})
+    if device is not None and config_entry.entry_id in device.config_entries:
+        device_registry.async_update_device(
+            device.id, new_identifiers={(DOMAIN, config_entry.entry_id)}
+        )
+
+
+async def async_migrate_entities(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> None:
+    """Key the entity unique ids, shared by all the modems before, by the entry id."""
+
+    @callback
+    def migrate_unique_id(entity_entry: er.RegistryEntry) -> dict | None:
+        if not entity_entry.unique_id.startswith(f"{DOMAIN}_"):
+            return None
+        key = entity_entry.unique_id.removeprefix(f"{DOMAIN}_")
+        return {"new_unique_id": f"{config_entry.entry_id}_{key}"}
+
+    await er.async_migrate_entries(hass, config_entry.entry_id, migrate_unique_id)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the refresh service, once for all the modems."""
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH):
+        return
+
+    async def async_handle_refresh(call: ServiceCall) -> None:
+        """Refresh the modems not fetched in the last REFRESH_MIN_INTERVAL seconds."""
+        await asyncio.gather(
+            *(
+                entry_data[COORDINATOR].async_refresh_now()
+                for entry_data in hass.data[DOMAIN].values()
+            )
+        )
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, async_handle_refresh)
+
+
+@callback
+def async_store_validated_modem(
+    hass: HomeAssistant, modem_data: ArrisCM3500ModemData
+) -> None:
+    """Keep a modem logged in by the config flow for the entry setup."""
+    hass.data.setdefault(VALIDATED_MODEMS, {})[modem_data.host] = modem_data
+
+
+@callback
+def async_pop_validated_modem(
+    hass: HomeAssistant, data: dict
+) -> ArrisCM3500ModemData | None:
+    """Return the modem logged in by the config flow, if the credentials match."""
+    modem_data = hass.data.get(VALIDATED_MODEMS, {}).pop(data[CONF_HOST], None)
+    if (
+        modem_data is not None
+        and modem_data.username == data[CONF_USERNAME]
+        and modem_data.password == data[CONF_PASSWORD]
+    ):
+        _LOGGER.debug("Reusing the session of the config flow login")
+        return modem_data
+    return None
+
+
 class ArrisCM3500ModemCoordinator(DataUpdateCoordinator):
     """Class to manage fetching mail data."""
 
@@ -74,31 +234,108 @@ class ArrisCM3500ModemCoordinator(DataUpdateCoordinator):
         """Initialize."""
         self.hass = hass
         self.config_entry = config_entry
+        self.options = dict(config_entry.options)
         self.modem = None
         self.modem_status_data = {}
         self.entities_list = None
+        self.statistics_list = []
+        self.statistics = None
+        self.channel_layout = None
+        self.layout_store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}"
+        )
         self.update_interval = update_interval
-        self.modem_data = ArrisCM3500ModemData(
+        self.slow_tier_cycles = config_entry.options.get(
+            CONF_SLOW_TIER_CYCLES, DEFAULT_SLOW_TIER_CYCLES
+        )
+        self.cycle = 0
+        self.refresh_slow_tier = True
+        # Entity values of the last refresh and the entities whose value changed,
+        # None to write every entity
+        self.values = {}
+        self.attribute_values = {}
+        self.changed_attrs = None
+        # Monotonic time of the last modem fetch, to rate limit the refresh service
+        self.last_fetch = None
+        # Monotonic and wall-clock time of the last successful fetch, shared by
+        # every channel record; past max_data_age seconds the data is stale
+        self.sampled_monotonic = None
+        self.sampled_at = None
+        # Refresh shared by the callers asking for new data meanwhile
+        self.update_task = None
+        self.max_data_age = 60 * config_entry.options.get(
+            CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE
+        )
+        if self.max_data_age <= update_interval.total_seconds():
+            # Options saved before the age was checked against the interval
+            self.max_data_age = 2 * update_interval.total_seconds()
+        self.stale = False
+        self.cancel_stale_timer = None
+        # Shared by all the entities of the modem
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name="Arris CM3500",
+            model="Arris CM3500",
+            manufacturer="Arris",
+        )
+        self.anomalies = ArrisCM3500ModemAnomalies(
+            config_entry.options.get(CONF_ANOMALY_SIGMA, DEFAULT_ANOMALY_SIGMA)
+        )
+        self.health = ArrisCM3500ModemHealth(health_thresholds(config_entry))
+        self.modem_data = async_pop_validated_modem(
+            hass, config_entry.data
+        ) or ArrisCM3500ModemData(
             config_entry.data.get(CONF_HOST),
             config_entry.data.get(CONF_USERNAME),
             config_entry.data.get(CONF_PASSWORD),
+            async_get_clientsession(hass, verify_ssl=False),
         )
+        self.metrics = ArrisCM3500ModemMetrics(self.modem_data.host)
 
         super().__init__(
             hass, _LOGGER, name=DOMAIN, update_interval=self.update_interval
         )
 
     async def _async_update_data(self):
-        """Fetch data."""
+        """Fetch data, sharing the refresh already in progress if any."""
+        # Overlapping refreshes, e.g. the refresh service during a scheduled
+        # one, would otherwise feed the same sample to update() twice
+        if self.update_task is None:
+            self.update_task = asyncio.get_running_loop().create_task(
+                self._async_fetch_data()
+            )
+            self.update_task.add_done_callback(self._update_task_done)
+        else:
+            _LOGGER.debug("Joining the refresh in progress")
+        # A cancelled caller leaves the refresh running for the others
+        return await asyncio.shield(self.update_task)
+
+    def _update_task_done(self, task: asyncio.Task) -> None:
+        self.update_task = None
+
+    async def _async_fetch_data(self) -> ArrisCM3500ModemDashboard:
+        """Fetch the modem status, retrying the login, and update the values."""
+        self.modem_data.stats.reset("bytes_downloaded", "rows_parsed")
+        self.last_fetch = monotonic()
 
         for attempt in range(1, MAX_RETRIES + 1):
-            self.modem_status_data = await self.modem_data.get_modem_status()
             _LOGGER.debug("Fetching data... Attempt %d/%d", attempt, MAX_RETRIES)
+            result = await self.modem_data.get_modem_status()
 
-            if "login_failed" not in self.modem_status_data:
+            if result.status is ArrisCM3500ModemStatus.SUCCESS:
+                self.modem_status_data = result.data
+                self.sampled_monotonic = monotonic()
+                self.sampled_at = dt_util.utcnow()
+                self.stale = False
+                self.async_schedule_stale()
                 _LOGGER.debug("New Data: %s", self.modem_status_data)
                 return await self.update()
 
+            if result.status is not ArrisCM3500ModemStatus.AUTH_REQUIRED:
+                raise UpdateFailed(
+                    f"Failed to fetch modem status ({result.status}): {result.error}"
+                )
+
             _LOGGER.warning(
                 "Login failed. Retrying in %d seconds... (%d/%d)",
                 RETRY_DELAY,
@@ -111,18 +348,185 @@ class ArrisCM3500ModemCoordinator(DataUpdateCoordinator):
         _LOGGER.error("All retries failed. Raising authentication error.")
         raise ConfigEntryAuthFailed("Credentials expired. Try to re-login.")
 
+    async def async_refresh_now(self) -> None:
+        """Refresh now, unless the modem has just been fetched."""
+        if (
+            self.last_fetch is not None
+            and monotonic() - self.last_fetch < REFRESH_MIN_INTERVAL
+        ):
+            _LOGGER.debug("Modem fetched less than %ds ago", REFRESH_MIN_INTERVAL)
+            return
+        self.last_fetch = monotonic()
+        await self.async_refresh()
+
+    async def async_load_layout(self) -> bool:
+        """Load the stored channel layout, return whether there is one."""
+        self.channel_layout = await self.layout_store.async_load()
+        return bool(self.channel_layout)
+
+    def create_layout_entities(self) -> None:
+        """Build the entities from the stored channel layout."""
+        _LOGGER.debug("Creating entities from the stored channel layout")
+        self.create_entities(
+            ArrisCM3500ModemDashboard(
+                hass=self.hass,
+                config_entry=self.config_entry,
+                modem_data={},
+                stats=self.modem_data.stats,
+                pages=self.modem_data.pages,
+                event_log=self.modem_data.event_log,
+            ),
+            self.channel_layout,
+        )
+
+    def create_entities(self, modem: ArrisCM3500ModemDashboard, layout: dict) -> None:
+        """Create the entity descriptions and, in statistics mode, the statistics."""
+        entities = ArrisCM3500ModemEntities(
+            modem,
+            layout,
+            self.config_entry.options.get(
+                CONF_STATISTICS_MODE, DEFAULT_STATISTICS_MODE
+            ),
+        )
+        self.entities_list = entities.entities_list
+        self.statistics_list = entities.statistics_list
+        if self.statistics_list:
+            # Channels without data are left out, like their disabled entities
+            self.statistics = ArrisCM3500ModemStatistics(
+                self.hass,
+                self.config_entry,
+                [
+                    description
+                    for description in self.statistics_list
+                    if description.entity_registry_enabled_default
+                ],
+            )
+
     async def update(self) -> ArrisCM3500ModemDashboard:
         """Update usage data from Arris CM3500."""
 
-        self.modem = ArrisCM3500ModemDashboard(
-            hass=self.hass,
-            config_entry=self.config_entry,
-            modem_data=self.modem_status_data,
-        )
-        if self.entities_list is None:
-            self.entities_list = ArrisCM3500ModemEntities(self.modem).entities_list
+        with self.modem_data.stats.measure("dashboard"):
+            # The slow tier values are only read every Nth cycle
+            self.refresh_slow_tier = self.cycle % self.slow_tier_cycles == 0
+            self.cycle += 1
+
+            new_anomalies = self.anomalies.update(self.modem_status_data)
+            self.health.update(self.modem_status_data)
+
+            self.modem = ArrisCM3500ModemDashboard(
+                hass=self.hass,
+                config_entry=self.config_entry,
+                modem_data=self.modem_status_data,
+                stats=self.modem_data.stats,
+                pages=self.modem_data.pages,
+                event_log=self.modem_data.event_log,
+                anomalies=self.anomalies.channels,
+                health=self.health,
+                sampled_at=self.sampled_at,
+            )
+            layout = merge_channel_layout(self.channel_layout, self.modem_status_data)
+            if self.entities_list is None:
+                self.create_entities(self.modem, layout)
+            if self.statistics is not None:
+                self.statistics.add(self.sampled_at, self.modem)
+            self.metrics.update(self.modem_status_data, self.sampled_at)
+
+            # Compute the entity values once, only the changed entities write.
+            # Slow tier values are kept from the last refresh between slow tier
+            # cycles
+            previous = self.values
+            values = {
+                description.key: previous[description.key]
+                if description.key in previous
+                and not self.refresh_slow_tier
+                and getattr(description, "slow_tier", False)
+                else getattr(self.modem, description.key)
+                for description in self.entities_list
+            }
+            attribute_values = {
+                description.key: getattr(self.modem, description.key + "_attributes")
+                for description in self.entities_list
+                if description.attributes
+            }
+            self.changed_attrs = {
+                attr
+                for attr, value in values.items()
+                if attr not in self.values
+                or value != self.values[attr]
+                or attribute_values.get(attr) != self.attribute_values.get(attr)
+            }
+            self.values = values
+            self.attribute_values = attribute_values
+
+        for anomaly in new_anomalies:
+            self.hass.bus.async_fire(
+                EVENT_ANOMALY,
+                {"entry_id": self.config_entry.entry_id, "host": self.modem_data.host}
+                | anomaly,
+            )
+        for entry in self.modem_data.event_log.pop_pending():
+            self.hass.bus.async_fire(
+                EVENT_MODEM_LOG,
+                {"entry_id": self.config_entry.entry_id, "host": self.modem_data.host}
+                | entry,
+            )
+
+        # Only write the cache when a new channel or field shows up
+        if layout != self.channel_layout:
+            _LOGGER.debug("Storing new channel layout")
+            self.channel_layout = layout
+            await self.layout_store.async_save(layout)
         _LOGGER.debug(
             "Update is completed. Next update in %s",
             self.update_interval,
         )
         return None
+
+    @callback
+    def async_schedule_stale(self) -> None:
+        """Mark the data stale max_data_age seconds after the last sample."""
+        self.async_cancel_stale()
+        self.cancel_stale_timer = async_call_later(
+            self.hass, self.max_data_age, self._async_mark_stale
+        )
+
+    @callback
+    def async_unload_statistics(self) -> None:
+        """Import the statistics of the unfinished hour."""
+        if self.statistics is not None:
+            self.statistics.async_unload()
+
+    @callback
+    def async_stop_statistics(self, event: Event) -> None:
+        """Import the statistics of the unfinished hour when Home Assistant stops."""
+        if self.statistics is not None and self.statistics.samples:
+            self.statistics.async_import()
+
+    @callback
+    def async_cancel_stale(self) -> None:
+        """Cancel the stale timer."""
+        if self.cancel_stale_timer is not None:
+            self.cancel_stale_timer()
+            self.cancel_stale_timer = None
+
+    @callback
+    def _async_mark_stale(self, _now) -> None:
+        self.cancel_stale_timer = None
+        _LOGGER.warning(
+            "No modem data since %s, the entities are unavailable", self.sampled_at
+        )
+        self.stale = True
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners and record the state write stage."""
+        stats = self.modem_data.stats
+        stats.reset("entities_written")
+        if not self.last_update_success or self.stale:
+            # Write every entity now and again after the next successful refresh
+            self.changed_attrs = None
+            self.values = {}
+        with stats.measure("state_write"):
+            super().async_update_listeners()
+        stats.log_summary()
@@ -0,0 +1,75 @@
+"""Binary sensor platform for Arris CM3500 integration."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import ArrisCM3500ModemCoordinator
+from .const import COORDINATOR, DOMAIN
+from .ArrisCM3500ModemEntities import ArrisCM3500BinarySensorEntityDescription
+from .ArrisCM3500ModemEntity import ArrisCM3500ModemEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Initialize Arris CM3500 config entry."""
+    coordinator: ArrisCM3500ModemCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+        COORDINATOR
+    ]
+
+    if coordinator.entities_list:
+        async_add_entities(
+            ArrisCM3500ModemBinarySensor(coordinator, description)
+            for description in coordinator.entities_list
+            if isinstance(description, ArrisCM3500BinarySensorEntityDescription)
+        )
+
+
+class ArrisCM3500ModemBinarySensor(ArrisCM3500ModemEntity, BinarySensorEntity):
+    """ArrisCM3500Modem Binary Sensor."""
+
+    entity_description: ArrisCM3500BinarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ArrisCM3500ModemCoordinator,
+        description: ArrisCM3500BinarySensorEntityDescription,
+    ) -> None:
+        """Initialize ArrisCM3500Modem Binary Sensor."""
+        super().__init__(coordinator, description)
+        self.entity_id = f"binary_sensor.arris_cm3500_{description.key}"
+        if self.attr in coordinator.values:
+            self._update_state()
+
+    @property
+    def available(self) -> bool:
+        """Return true once the modem data has been fetched."""
+        if self.coordinator.modem is None:
+            return False
+        return super().available
+
+    def _update_state(self) -> None:
+        """Copy the anomaly state computed by the coordinator."""
+        self._attr_is_on = self.coordinator.values[self.attr]
+        self._attr_extra_state_attributes = self.coordinator.attribute_values[self.attr]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        changed_attrs = self.coordinator.changed_attrs
+        if changed_attrs is not None and self.attr not in changed_attrs:
+            return
+        if self.attr in self.coordinator.values:
+            self._update_state()
+        self.async_write_ha_state()
+        self.coordinator.modem_data.stats.count("entities_written")
@@ -8,7 +8,11 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
+from aiohttp import ClientTimeout
+
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
     TextSelector,
     TextSelectorConfig,
@@ -16,10 +20,34 @@ from homeassistant.helpers.selector import (
 )
 
 from .const import (
+    CONF_ANOMALY_SIGMA,
+    CONF_DS_POWER_LIMIT,
+    CONF_FAST_START,
+    CONF_MAX_DATA_AGE,
+    CONF_MIN_RXMER,
+    CONF_MIN_SNR,
+    CONF_SLOW_TIER_CYCLES,
+    CONF_STATISTICS_MODE,
+    CONF_UPDATE_INTERVAL,
+    CONF_US_POWER_MAX,
+    CONF_US_POWER_MIN,
+    DEFAULT_ANOMALY_SIGMA,
+    DEFAULT_DS_POWER_LIMIT,
+    DEFAULT_FAST_START,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MIN_RXMER,
+    DEFAULT_MIN_SNR,
     DEFAULT_HOST,
+    DEFAULT_SLOW_TIER_CYCLES,
+    DEFAULT_STATISTICS_MODE,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_US_POWER_MAX,
+    DEFAULT_US_POWER_MIN,
+    PROBE_TIMEOUT,
 )
 
 from .const import DOMAIN
+from . import async_store_validated_modem
 from .ArrisCM3500ModemData import ArrisCM3500ModemData
 
 _LOGGER = logging.getLogger(__name__)
@@ -53,6 +81,25 @@ class ArrisCM3500ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.username = None
         self.password = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry):
+        """Get the options flow for this handler."""
+        return ArrisCM3500OptionsFlow()
+
+    async def async_probe_login(self):
+        """Log in with a short timeout, keep the session for the entry setup."""
+        self.data = ArrisCM3500ModemData(
+            self.host,
+            self.username,
+            self.password,
+            async_get_clientsession(self.hass, verify_ssl=False),
+        )
+        response = await self.data.login(timeout=ClientTimeout(total=PROBE_TIMEOUT))
+        if response:
+            async_store_validated_modem(self.hass, self.data)
+        return response
+
     async def async_step_user(self, user_input=None):
         """Handle login step."""
         errors = {}
@@ -65,10 +112,7 @@ class ArrisCM3500ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self.password = user_input[CONF_PASSWORD]
 
                 # Perform login using the provided credentials
-                self.data = ArrisCM3500ModemData(
-                    self.host, self.username, self.password
-                )
-                response = await self.data.login()
+                response = await self.async_probe_login()
 
                 if response:
                     # Create the config entry with the collected data
@@ -110,14 +154,11 @@ class ArrisCM3500ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self.password = user_input[CONF_PASSWORD]
 
                 # Perform login using the provided credentials
-                self.data = ArrisCM3500ModemData(
-                    self.host, self.username, self.password
-                )
-                response = await self.data.login()
+                response = await self.async_probe_login()
 
                 if response:
                     data = self.reauth_entry.data.copy()
-                    self.hass.config_entries.async_update_entry(
+                    return self.async_update_reload_and_abort(
                         self.reauth_entry,
                         data={
                             **data,
@@ -126,13 +167,6 @@ class ArrisCM3500ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             CONF_PASSWORD: user_input[CONF_PASSWORD],
                         },
                     )
-                    self.hass.async_create_task(
-                        self.hass.config_entries.async_reload(
-                            self.reauth_entry.entry_id
-                        )
-                    )
-
-                    return self.async_abort(reason="reauth_successful")
                 errors["base"] = "login_failed"
 
             except Exception as e:
@@ -154,3 +188,81 @@ class ArrisCM3500ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
         )
+
+
+class ArrisCM3500OptionsFlow(config_entries.OptionsFlow):
+    """Handle options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the polling options."""
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MAX_DATA_AGE] <= user_input[CONF_UPDATE_INTERVAL]:
+                errors[CONF_MAX_DATA_AGE] = "max_data_age_too_short"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        # The flow handler is the entry id, OptionsFlow.config_entry only
+        # exists from Home Assistant 2024.11
+        entry = self.hass.config_entries.async_get_entry(self.handler)
+        options = user_input or entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_SLOW_TIER_CYCLES,
+                        default=options.get(
+                            CONF_SLOW_TIER_CYCLES, DEFAULT_SLOW_TIER_CYCLES
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_MAX_DATA_AGE,
+                        default=options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_FAST_START,
+                        default=options.get(CONF_FAST_START, DEFAULT_FAST_START),
+                    ): bool,
+                    vol.Required(
+                        CONF_STATISTICS_MODE,
+                        default=options.get(
+                            CONF_STATISTICS_MODE, DEFAULT_STATISTICS_MODE
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_ANOMALY_SIGMA,
+                        default=options.get(CONF_ANOMALY_SIGMA, DEFAULT_ANOMALY_SIGMA),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_DS_POWER_LIMIT,
+                        default=options.get(
+                            CONF_DS_POWER_LIMIT, DEFAULT_DS_POWER_LIMIT
+                        ),
+                    ): vol.Coerce(float),
+                    vol.Required(
+                        CONF_MIN_SNR,
+                        default=options.get(CONF_MIN_SNR, DEFAULT_MIN_SNR),
+                    ): vol.Coerce(float),
+                    vol.Required(
+                        CONF_US_POWER_MIN,
+                        default=options.get(CONF_US_POWER_MIN, DEFAULT_US_POWER_MIN),
+                    ): vol.Coerce(float),
+                    vol.Required(
+                        CONF_US_POWER_MAX,
+                        default=options.get(CONF_US_POWER_MAX, DEFAULT_US_POWER_MAX),
+                    ): vol.Coerce(float),
+                    vol.Required(
+                        CONF_MIN_RXMER,
+                        default=options.get(CONF_MIN_RXMER, DEFAULT_MIN_RXMER),
+                    ): vol.Coerce(float),
+                }
+            ),
+            errors=errors,
+        )
@@ -9,4 +9,141 @@ RETRY_DELAY = 10
 
 DEFAULT_HOST = "192.168.100.1"
 
+CONF_FAST_START = "fast_start"
+DEFAULT_FAST_START = True
+
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_SLOW_TIER_CYCLES = "slow_tier_cycles"
+DEFAULT_SLOW_TIER_CYCLES = 10
+
+# Fields that rarely change, refreshed every CONF_SLOW_TIER_CYCLES polls. All
+# other fields are refreshed on every poll.
+SLOW_TIER_FIELDS = (
+    "Frequency",
+    "Modulation",
+    "Channel_Type",
+    "Symbol_Rate",
+    "FFT_Type",
+    "Channel_Width",
+    "Active_Subcarriers",
+    "First_Subcarrier",
+    "Last_Subcarrier",
+    "Lower_Frequency",
+    "Upper_Frequency",
+)
+
+# Keep the channel metrics as hourly statistics instead of entities
+CONF_STATISTICS_MODE = "statistics_mode"
+DEFAULT_STATISTICS_MODE = False
+# Samples of the unfinished hour, handed from an unloaded entry to its next setup
+PENDING_STATISTICS = f"{DOMAIN}_pending_statistics"
+
+# Minutes after the last successful fetch before the entities become unavailable
+CONF_MAX_DATA_AGE = "max_data_age"
+DEFAULT_MAX_DATA_AGE = 10
+
+# OpenMetrics endpoint serving the channel data of all the modems, registered once
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+METRICS_VIEW = f"{DOMAIN}_metrics_view"
+
+# Service refreshing the modems now, at most once per interval in seconds
+SERVICE_REFRESH = "refresh"
+REFRESH_MIN_INTERVAL = 30
+
+STORAGE_VERSION = 1
+
+# Channel id key of each channel kind
+CHANNEL_ID_KEYS = {
+    "Downstream_QAM": "DCID",
+    "Upstream_QAM": "UCID",
+    "Downstream_OFDM": "DCID_OFDM",
+    "Upstream_OFDM": "UCID_OFDM",
+}
+
+# Values of the padded channels, which carry no real data
+EMPTY_VALUES = (0, "0", "N/A", "", None)
+
+# Timeout in seconds of the login probe done by the config flow
+PROBE_TIMEOUT = 10
+
 DATA_LISTENER = "data_listener"
+# Modems logged in by the config flow, handed off to the entry setup
+VALIDATED_MODEMS = f"{DOMAIN}_validated_modems"
+
+# Number of raw modem responses kept for the diagnostics download
+RAW_RESPONSE_BUFFER_SIZE = 10
+
+# Event log: levels counted as critical, known event types by description keyword
+CRITICAL_EVENT_LEVELS = ("1", "2", "3", "emergency", "alert", "critical")
+EVENT_TYPES = {
+    "t3_timeout": "t3 time-out",
+    "t4_timeout": "t4 time-out",
+    "ranging_failure": "ranging",
+}
+# Home Assistant event fired for each new event log entry
+EVENT_MODEM_LOG = f"{DOMAIN}_event"
+# Number of new event log entries kept for the diagnostics download
+EVENT_LOG_BUFFER_SIZE = 50
+
+# Responses are decided from the first HEAD_SIZE bytes, then read in chunks
+HEAD_SIZE = 4 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+
+STATUS_PAGE = "status_cgi"
+# Additional modem pages, fetched next to the status page every interval seconds.
+# The provisioning page is the label/value tables of the status page, parsed from
+# the status response read to the end instead of fetched separately.
+MODEM_PAGES = {
+    "system": {"path": "vers_cgi", "interval": 3600},
+    "provisioning": {"path": STATUS_PAGE, "interval": 600},
+    "events": {"path": "event_cgi", "interval": 300},
+}
+# Requests sent to the modem at the same time
+MAX_CONCURRENT_REQUESTS = 2
+
+# Sensors showing a value of an additional page: page, exact label of the value
+# (without the trailing colon) and whether the whole page is shown as state
+# attributes
+PAGE_SENSORS = {
+    "system_uptime": ("provisioning", "System Uptime", False),
+    "provisioning_status": ("provisioning", "CM Status", True),
+    "software_version": ("system", "Software Version", True),
+}
+
+CONF_ANOMALY_SIGMA = "anomaly_sigma"
+DEFAULT_ANOMALY_SIGMA = 3.0
+# Channel metrics watched for anomalies, counters are watched per poll increase
+ANOMALY_METRICS = {
+    "Downstream_QAM": ("Power", "SNR", "Uncorrectables"),
+    "Upstream_QAM": ("Power",),
+    "Downstream_OFDM": ("RxMER_Data",),
+    "Upstream_OFDM": ("Tx_Power",),
+}
+COUNTER_FIELDS = ("Correcteds", "Uncorrectables")
+# Weight of a new sample in the moving mean and variance
+ANOMALY_ALPHA = 0.05
+# Samples needed before a metric can be anomalous
+ANOMALY_MIN_SAMPLES = 10
+# Lower bound of the standard deviation, so steady metrics do not flag noise
+ANOMALY_MIN_STD = 0.5
+# Home Assistant event fired when a channel metric becomes anomalous
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+# Entity attribute prefix of each channel kind
+CHANNEL_PREFIXES = {
+    "Downstream_QAM": "dcid",
+    "Upstream_QAM": "ucid",
+    "Downstream_OFDM": "dcid_ofdm",
+    "Upstream_OFDM": "ucid_ofdm",
+}
+
+# DOCSIS 3.0/3.1 health thresholds
+CONF_DS_POWER_LIMIT = "ds_power_limit"
+DEFAULT_DS_POWER_LIMIT = 15.0
+CONF_MIN_SNR = "min_snr"
+DEFAULT_MIN_SNR = 33.0
+CONF_US_POWER_MIN = "us_power_min"
+DEFAULT_US_POWER_MIN = 35.0
+CONF_US_POWER_MAX = "us_power_max"
+DEFAULT_US_POWER_MAX = 51.0
+CONF_MIN_RXMER = "min_rxmer"
+DEFAULT_MIN_RXMER = 34.0
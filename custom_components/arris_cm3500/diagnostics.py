@@ -0,0 +1,46 @@
+"""Diagnostics support for Arris CM3500 integration."""
+
+from __future__ import annotations
+
+from time import monotonic
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import ArrisCM3500ModemCoordinator
+from .const import COORDINATOR, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: ArrisCM3500ModemCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+        COORDINATOR
+    ]
+    modem_data = coordinator.modem_data
+
+    return {
+        "config_entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "stats": {
+            "durations": modem_data.stats.durations,
+            "counters": modem_data.stats.counters,
+        },
+        "sampled_at": coordinator.sampled_at,
+        "data_age": round(monotonic() - coordinator.sampled_monotonic, 1)
+        if coordinator.sampled_monotonic is not None
+        else None,
+        "stale": coordinator.stale,
+        "parse_results": coordinator.modem_status_data,
+        "pages": modem_data.pages,
+        "event_log": {
+            "mark": modem_data.event_log.mark,
+            "recent": list(modem_data.event_log.recent),
+        },
+        "raw_responses": modem_data.get_raw_responses(),
+    }
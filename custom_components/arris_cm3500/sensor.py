@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import RestoreSensor
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import ArrisCM3500ModemCoordinator
 from .const import COORDINATOR, DOMAIN
+from .ArrisCM3500ModemEntities import ArrisCM3500SensorEntityDescription
 from .ArrisCM3500ModemEntity import ArrisCM3500ModemEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,71 +28,66 @@ async def async_setup_entry(
         COORDINATOR
     ]
 
-    if coordinator.modem:
+    # Remove the channel metric entities replaced by statistics
+    entity_registry = er.async_get(hass)
+    for description in coordinator.statistics_list:
+        if entity_id := entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{config_entry.entry_id}_{description.key}"
+        ):
+            entity_registry.async_remove(entity_id)
+
+    if coordinator.entities_list:
         async_add_entities(
-            ArrisCM3500ModemSensor(
-                hass=hass,
-                config_entry=config_entry,
-                coordinator=coordinator,
-                attr=entity.attr,
-                name=entity.name,
-                icon=entity.icon,
-                unit=entity.unit,
-                device_class=entity.device_class,
-                value=getattr(coordinator.modem, entity.attr),
-                state_class=entity.state_class,
-                display_precision=entity.display_precision,
-            )
-            for entity in (
-                entity
-                for entity in coordinator.entities_list
-                if entity.component == "sensor"
-            )
+            ArrisCM3500ModemSensor(coordinator, description)
+            for description in coordinator.entities_list
+            if isinstance(description, ArrisCM3500SensorEntityDescription)
         )
 
 
-class ArrisCM3500ModemSensor(ArrisCM3500ModemEntity, SensorEntity):
+class ArrisCM3500ModemSensor(ArrisCM3500ModemEntity, RestoreSensor):
     """ArrisCM3500Modem Sensor."""
 
+    entity_description: ArrisCM3500SensorEntityDescription
+
     def __init__(
         self,
-        hass: HomeAssistant,
-        config_entry: ConfigEntry,
-        coordinator: str,
-        attr: str,
-        name: str,
-        icon: str,
-        unit: str,
-        device_class: str,
-        value: str,
-        state_class: str,
-        display_precision: int,
+        coordinator: ArrisCM3500ModemCoordinator,
+        description: ArrisCM3500SensorEntityDescription,
     ) -> None:
         """Initialize ArrisCM3500Modem Sensor."""
-        super().__init__(
-            config_entry=config_entry,
-            coordinator=coordinator,
-            attr=attr,
-        )
-        self.hass = hass
-        self.config_entry = config_entry
-        self.coordinator = coordinator
-        self.attr = attr
-        self._attr_name = name
-        self._attr_unique_id = f"arris_cm3500_{attr}"
-        self._attr_has_entity_name = True
-        self._attr_icon = icon
-        self._attr_native_unit_of_measurement = unit
-        self._attr_device_class = device_class
-        self._attr_state_class = state_class
-        self._attr_available = True
-        self._attr_native_value = value
-        self._attr_should_poll = False
-        self._attr_suggested_display_precision = display_precision
-        self.entity_id = f"sensor.arris_cm3500_{attr}"
+        super().__init__(coordinator, description)
+        self.entity_id = f"sensor.arris_cm3500_{description.key}"
+        self._attr_native_value = coordinator.values.get(description.key)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last value until the first refresh completes."""
+        await super().async_added_to_hass()
+        if self.coordinator.modem is None and (
+            last_sensor_data := await self.async_get_last_sensor_data()
+        ):
+            self._attr_native_value = last_sensor_data.native_value
+
+    @property
+    def available(self) -> bool:
+        """Return true if a restored value is shown or the entity is supported."""
+        if self.coordinator.modem is None:
+            return self._attr_native_value is not None and (
+                not self.coordinator.stale
+                or self.entity_description.available_when_stale
+            )
+        return super().available
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._attr_native_value = getattr(self.coordinator.modem, self.attr)
+        changed_attrs = self.coordinator.changed_attrs
+        if changed_attrs is not None and self.attr not in changed_attrs:
+            return
+        if self.attr in self.coordinator.values:
+            self._attr_native_value = self.coordinator.values[self.attr]
+            if self.entity_description.attributes:
+                self._attr_extra_state_attributes = self.coordinator.attribute_values[
+                    self.attr
+                ]
         self.async_write_ha_state()
+        self.coordinator.modem_data.stats.count("entities_written")
@@ -0,0 +1,45 @@
+"""Fixtures for the Arris CM3500 tests."""
+
+import importlib.util
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_module(name: str, path: Path):
+    """Load a module by path, the integration package would import Home Assistant."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the worker processes of the parse tool can unpickle it
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def modem_parser():
+    """Return the parser module, loaded without Home Assistant."""
+    return load_module(
+        "ArrisCM3500ModemParser",
+        ROOT / "custom_components" / "arris_cm3500" / "ArrisCM3500ModemParser.py",
+    )
+
+
+@pytest.fixture(scope="session")
+def parse_tool():
+    """Return the offline status page parse tool."""
+    return load_module("parse_status_pages", ROOT / "tools" / "parse_status_pages.py")
+
+
+@pytest.fixture
+def load_fixture():
+    """Return a function reading a saved page."""
+
+    def load(name: str) -> str:
+        return (FIXTURES / name).read_text(encoding="utf-8")
+
+    return load
@@ -0,0 +1,81 @@
+"""Tests for the event log parser."""
+
+import pytest
+
+NEWEST_FIRST = "event_cgi.html"
+OLDEST_FIRST = "event_cgi_oldest_first.html"
+
+
+def parse(modem_parser, page: str, mark=None):
+    """Parse a whole page, return the parser."""
+    parser = modem_parser.EventLogParser(mark)
+    parser.feed(page)
+    parser.close()
+    return parser
+
+
+@pytest.fixture
+def entries(modem_parser, load_fixture):
+    """Return the entries of the newest first log."""
+    return parse(modem_parser, load_fixture(NEWEST_FIRST)).result()
+
+
+@pytest.mark.parametrize("page", [NEWEST_FIRST, OLDEST_FIRST])
+def test_entries_newest_first(modem_parser, load_fixture, entries, page):
+    """Test the entries are returned newest first whatever the page order."""
+    parser = parse(modem_parser, load_fixture(page))
+
+    assert parser.newest_first is (page == NEWEST_FIRST)
+    assert parser.result() == entries
+    assert len(entries) == 7
+    assert entries[0]["time"] == "03/18/2024 10:15:02"
+    assert entries[-2]["description"] == "Dynamic Range Window violation"
+
+
+def test_entries_without_time(modem_parser, entries):
+    """Test the entries logged before the time was set are kept, not the header."""
+    assert entries[-1]["time"] == "Time Not Established"
+    assert modem_parser.event_time(entries[-1]) is None
+    assert all(entry["time"] != "Date Time" for entry in entries)
+
+
+@pytest.mark.parametrize("page", [NEWEST_FIRST, OLDEST_FIRST])
+def test_entries_newer_than_mark(modem_parser, load_fixture, entries, page):
+    """Test only the entries newer than the high-water mark are returned."""
+    mark = modem_parser.event_key(entries[3])
+
+    assert parse(modem_parser, load_fixture(page), mark).result() == entries[:3]
+
+
+@pytest.mark.parametrize("page", [NEWEST_FIRST, OLDEST_FIRST])
+def test_no_new_entries(modem_parser, load_fixture, entries, page):
+    """Test nothing is returned when the newest entry is the mark."""
+    mark = modem_parser.event_key(entries[0])
+
+    assert parse(modem_parser, load_fixture(page), mark).result() == []
+
+
+def test_stop_at_mark(modem_parser, load_fixture, entries):
+    """Test a newest first log is only parsed up to the mark."""
+    parser = modem_parser.EventLogParser(modem_parser.event_key(entries[1]))
+    parser.feed(load_fixture(NEWEST_FIRST))
+
+    assert parser.done
+    assert len(parser.entries) == 2
+
+
+def test_oldest_first_read_to_the_end(modem_parser, load_fixture, entries):
+    """Test an oldest first log is not cut at the mark."""
+    parser = parse(
+        modem_parser, load_fixture(OLDEST_FIRST), modem_parser.event_key(entries[1])
+    )
+
+    assert not parser.done
+    assert parser.result() == entries[:1]
+
+
+def test_cleared_log(modem_parser, load_fixture, entries):
+    """Test a log without the mark, e.g. cleared by a reboot, is returned whole."""
+    mark = ("01/01/2024 00:00:00", 0)
+
+    assert parse(modem_parser, load_fixture(OLDEST_FIRST), mark).result() == entries
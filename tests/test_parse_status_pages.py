@@ -0,0 +1,74 @@
+"""Tests for the offline status page parse tool."""
+
+import json
+import tarfile
+
+import pytest
+
+PAGES = ("status_cgi.html", "status_cgi_8k_ofdma.html")
+
+
+@pytest.fixture
+def pages(tmp_path, load_fixture):
+    """Return a directory of saved status pages."""
+    directory = tmp_path / "pages"
+    directory.mkdir()
+    for name in PAGES:
+        (directory / name).write_text(load_fixture(name), encoding="utf-8")
+    return directory
+
+
+def test_json_lines(parse_tool, modem_parser, pages, load_fixture, tmp_path):
+    """Test one object per page, in order, with the channels of the parser."""
+    output = tmp_path / "channels.jsonl"
+
+    assert parse_tool.main([str(pages), "--output", str(output), "--workers", "1"]) == 0
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line.pop("page") for line in lines] == list(PAGES)
+    assert lines[0] == modem_parser.extract_data(load_fixture(PAGES[0]))
+
+
+def test_columns_tarball(parse_tool, pages, tmp_path):
+    """Test the columns of a tarball have one type each, numbers as floats."""
+    archive = tmp_path / "pages.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        for name in PAGES:
+            tar.add(pages / name, arcname=name)
+    output = tmp_path / "channels.json"
+
+    parse_tool.main(
+        [str(archive), "--format", "columns", "--output", str(output), "--workers", "1"]
+    )
+
+    columns = json.loads(output.read_text())
+    downstream = columns["Downstream_QAM"]
+    assert len(downstream["page"]) == 64
+    assert downstream["Power"][:2] == [3.2, -1.2]
+    # Padded channels are numbers too, not the int 0 next to strings
+    assert downstream["Power"][-1] == 0.0
+    for table in columns.values():
+        for field, column in table.items():
+            types = {type(value) for value in column}
+            expected = str if field in parse_tool.TEXT_COLUMNS | {"page"} else float
+            assert types == {expected}, field
+
+
+def test_output_in_source(parse_tool, pages, tmp_path):
+    """Test only the pages are parsed, not the output or other files."""
+    output = pages / "channels.html"
+    (pages / "notes.txt").write_text("not a page")
+
+    parse_tool.main([str(pages), "--output", str(output), "--workers", "1"])
+
+    names = [json.loads(line)["page"] for line in output.read_text().splitlines()]
+    assert names == list(PAGES)
+
+
+def test_missing_source(parse_tool, tmp_path, capsys):
+    """Test a source that is neither a directory nor a tarball is a usage error."""
+    with pytest.raises(SystemExit) as error:
+        parse_tool.main([str(tmp_path / "missing")])
+
+    assert error.value.code == 2
+    assert "neither a directory nor a tarball" in capsys.readouterr().err
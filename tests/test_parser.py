@@ -0,0 +1,139 @@
+"""Tests for the status page parser."""
+
+import re
+
+import pytest
+
+STATUS_PAGE = "status_cgi.html"
+VARIANT_PAGE = "status_cgi_8k_ofdma.html"
+
+# Header rows of the channel tables, their first cell is empty
+HEADER_ROW = re.compile(r"<tr><td>&nbsp;</td>.*?</tr>\n")
+
+
+def parse(modem_parser, page: str, schemas=None):
+    """Parse a whole page, return the parser."""
+    parser = modem_parser.ArrisCM3500ModemParser(schemas)
+    parser.feed(page)
+    parser.close()
+    return parser
+
+
+def test_schema_path(modem_parser, load_fixture):
+    """Test the channel tables are read by the columns of their header."""
+    parser = parse(modem_parser, load_fixture(STATUS_PAGE))
+
+    assert {position: schema.kind for position, schema in parser.schemas.items()} == {
+        1: "Downstream_QAM",
+        2: "Downstream_OFDM",
+        3: "Upstream_QAM",
+        4: "Upstream_OFDM",
+    }
+    result = parser.result()
+    assert result["Downstream_QAM"][1] == {
+        "DCID": "6",
+        "Frequency": "610.00",
+        "Power": "-1.20",
+        "SNR": "37.36",
+        "Modulation": "256QAM",
+        "Correcteds": "12",
+        "Uncorrectables": "2",
+    }
+    assert result["Downstream_OFDM"][1]["DCID_OFDM"] == "2"
+    assert result["Downstream_OFDM"][1]["Channel_Width"] == "190"
+    assert result["Upstream_QAM"][3]["Power"] == "45.75"
+    assert result["Upstream_OFDM"][0]["Tx_Power"] == "40.50"
+    assert len(result["Downstream_QAM"]) == 32
+    assert len(result["Upstream_QAM"]) == 8
+
+
+def test_8k_ofdma_variant(modem_parser, load_fixture):
+    """Test a firmware with 8K OFDM, 4K OFDMA and moved columns."""
+    result = parse(modem_parser, load_fixture(VARIANT_PAGE)).result()
+
+    assert result["Downstream_QAM"][0]["Correcteds"] == "4"
+    assert result["Downstream_OFDM"][0]["FFT_Type"] == "8K"
+    assert result["Downstream_OFDM"][0]["Last_Subcarrier"] == "7895"
+    assert result["Upstream_OFDM"][:2] == [
+        {
+            "UCID_OFDM": "0",
+            "FFT_Type": "4K",
+            "Tx_Power": "41.25",
+            "Channel_Width": "96",
+            "Active_Subcarriers": "1900",
+            "First_Subcarrier": "148",
+            "Last_Subcarrier": "2047",
+            "Lower_Frequency": "108",
+            "Upper_Frequency": "204",
+        },
+        {
+            "UCID_OFDM": "1",
+            "FFT_Type": "4K",
+            "Tx_Power": "40.75",
+            "Channel_Width": "48",
+            "Active_Subcarriers": "960",
+            "First_Subcarrier": "148",
+            "Last_Subcarrier": "1107",
+            "Lower_Frequency": "60",
+            "Upper_Frequency": "108",
+        },
+    ]
+    # The 4K OFDMA channels are not taken for downstream OFDM channels
+    assert result["Downstream_OFDM"][1]["FFT_Type"] == "N/A"
+
+
+def test_cached_schemas(modem_parser, load_fixture):
+    """Test the schemas of a previous page are reused when the headers match."""
+    page = load_fixture(STATUS_PAGE)
+    first = parse(modem_parser, page)
+    second = parse(modem_parser, page, first.schemas)
+
+    assert second.result() == first.result()
+    for position, schema in second.schemas.items():
+        assert schema is first.schemas[position]
+
+
+@pytest.mark.parametrize("cached_page", [STATUS_PAGE, VARIANT_PAGE])
+def test_changed_header_detected(modem_parser, load_fixture, cached_page):
+    """Test a header different from the cached one is detected again."""
+    cached = parse(modem_parser, load_fixture(cached_page)).schemas
+    page = load_fixture(VARIANT_PAGE)
+
+    assert (
+        parse(modem_parser, page, cached).result() == parse(modem_parser, page).result()
+    )
+
+
+def test_legacy_fallback(modem_parser, load_fixture):
+    """Test tables without a header row are parsed by the row heuristics."""
+    page = load_fixture(STATUS_PAGE)
+    headerless = HEADER_ROW.sub("", page)
+    assert headerless != page
+
+    parser = parse(modem_parser, headerless)
+
+    assert parser.schemas == {}
+    assert parser.result() == parse(modem_parser, page).result()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 512])
+def test_chunked_feeding(modem_parser, load_fixture, chunk_size):
+    """Test feeding the page in chunks gives the same result and stops early."""
+    page = load_fixture(STATUS_PAGE)
+    parser = modem_parser.ArrisCM3500ModemParser()
+    fed = 0
+    while not parser.done and fed < len(page):
+        parser.feed(page[fed : fed + chunk_size])
+        fed += chunk_size
+
+    assert parser.done
+    # The chunk completing the last channel table is the last one fed
+    assert fed - chunk_size < page.index("<h4>Status</h4>")
+    assert parser.result() == parse(modem_parser, page).result()
+
+
+def test_extract_data(modem_parser, load_fixture):
+    """Test the one shot helper matches the incremental parser."""
+    page = load_fixture(STATUS_PAGE)
+
+    assert modem_parser.extract_data(page) == parse(modem_parser, page).result()
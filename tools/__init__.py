@@ -0,0 +1 @@
+"""Developer tools for the Arris CM3500 integration."""
@@ -0,0 +1,201 @@
+"""Parse archived Arris CM3500 status pages offline.
+
+Runs without Home Assistant, the parser module of the integration only uses the
+standard library. From the repository root:
+
+    python -m tools.parse_status_pages pages/
+    python tools/parse_status_pages.py pages.tar.gz --format columns \\
+        --output channels.json
+
+Pages are parsed across processes. JSON Lines output streams one object per page,
+in input order; columnar output writes one column list per field and channel
+kind, with the page name as the "page" column.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import importlib.util
+from itertools import islice
+import json
+import logging
+import os
+from pathlib import Path
+import sys
+import tarfile
+from time import perf_counter
+
+_LOGGER = logging.getLogger(__name__)
+
+PARSER_MODULE = "arris_cm3500_parser"
+PARSER_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components"
+    / "arris_cm3500"
+    / "ArrisCM3500ModemParser.py"
+)
+
+
+def load_parser():
+    """Load the parser module by path.
+
+    Importing it from the integration package would import Home Assistant.
+    """
+    if (module := sys.modules.get(PARSER_MODULE)) is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(PARSER_MODULE, PARSER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PARSER_MODULE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+modem_parser = load_parser()
+# Fields written as text in the columnar output, the others are numbers
+TEXT_COLUMNS = frozenset(
+    (
+        *modem_parser.TEXT_FIELDS,
+        *(id_field for id_field, _ in modem_parser.TABLE_KINDS.values()),
+    )
+)
+
+# Table schemas of the last page parsed by this worker process, pages of the same
+# firmware then skip the header detection
+_schemas = {}
+
+
+def is_page(name: str) -> bool:
+    """Return true for a saved status page, by its file name."""
+    name = Path(name).name
+    return name.endswith((".html", ".htm")) or "cgi" in name
+
+
+def iter_pages(source: Path, skip: Path | None = None):
+    """Yield the name and either the path or the content of each page.
+
+    Files that are not pages are left out, as is the skip path, the output
+    when it is written into the source directory.
+    """
+    if source.is_dir():
+        for path in sorted(source.rglob("*")):
+            if path.is_file() and is_page(path.name) and path.resolve() != skip:
+                yield str(path.relative_to(source)), path
+        return
+
+    with tarfile.open(source) as archive:
+        for member in archive:
+            if member.isfile() and is_page(member.name):
+                yield member.name, archive.extractfile(member).read()
+
+
+def parse_page(page: tuple[str, Path | bytes]) -> tuple[str, dict]:
+    """Parse one page, return its name and channels."""
+    global _schemas
+
+    name, source = page
+    content = source if isinstance(source, bytes) else source.read_bytes()
+    parser = modem_parser.ArrisCM3500ModemParser(_schemas)
+    try:
+        parser.feed(content.decode("utf-8", errors="replace"))
+        parser.close()
+    except Exception as error:
+        _LOGGER.error("Error parsing %s, error %s", name, error)
+    _schemas = parser.schemas
+    return name, parser.result()
+
+
+def parse_pages(executor: ProcessPoolExecutor, pages, workers: int, chunksize: int):
+    """Parse the pages in order, submitting a bounded batch at a time."""
+    batch_size = chunksize * workers * 4
+    while batch := list(islice(pages, batch_size)):
+        yield from executor.map(parse_page, batch, chunksize=chunksize)
+
+
+def column_value(field: str, value):
+    """Return a value with the type of its column, None if it is not a number."""
+    if field in TEXT_COLUMNS:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def write_columns(results, output) -> int:
+    """Write the channels as one column list per field and kind, return the pages."""
+    columns = {}
+    pages = 0
+    for name, data in results:
+        pages += 1
+        for kind, channels in data.items():
+            table = columns.setdefault(kind, {"page": []})
+            for channel in channels:
+                rows = len(table["page"])
+                table["page"].append(name)
+                for field, value in channel.items():
+                    if field not in table:
+                        # Fields missing from earlier rows are padded with null
+                        table[field] = [None] * rows
+                    table[field].append(column_value(field, value))
+                for column in table.values():
+                    if len(column) == rows:
+                        column.append(None)
+    json.dump(columns, output)
+    output.write("\n")
+    return pages
+
+
+def write_json_lines(results, output) -> int:
+    """Write one JSON object per page, return the pages."""
+    pages = 0
+    for name, data in results:
+        pages += 1
+        output.write(json.dumps({"page": name, **data}) + "\n")
+    return pages
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse the pages of a directory or tarball."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", type=Path, help="directory or tarball of pages")
+    parser.add_argument(
+        "--format", choices=("jsonl", "columns"), default="jsonl", dest="output_format"
+    )
+    parser.add_argument("--output", type=Path, help="output file, stdout by default")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=16)
+    args = parser.parse_args(argv)
+    if not args.source.is_dir() and not (
+        args.source.is_file() and tarfile.is_tarfile(args.source)
+    ):
+        parser.error(f"{args.source} is neither a directory nor a tarball")
+    logging.basicConfig(level=logging.WARNING)
+
+    write = write_columns if args.output_format == "columns" else write_json_lines
+    output = args.output.open("w") if args.output else sys.stdout
+    output_path = args.output.resolve() if args.output else None
+    start = perf_counter()
+    try:
+        with ProcessPoolExecutor(args.workers) as executor:
+            pages = write(
+                parse_pages(
+                    executor,
+                    iter_pages(args.source, skip=output_path),
+                    args.workers,
+                    args.chunksize,
+                ),
+                output,
+            )
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = perf_counter() - start
+    print(
+        f"Parsed {pages} pages in {elapsed:.2f}s ({pages / elapsed:.1f} pages/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())